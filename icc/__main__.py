@@ -0,0 +1,5 @@
+import sys
+
+from icc.cli import main
+
+sys.exit(main())
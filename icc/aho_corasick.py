@@ -0,0 +1,73 @@
+from collections import deque
+
+
+class AutomatoGatilhos:
+    # Autômato de Aho-Corasick sobre os gatilhos/palavras-chave de todas as temáticas.
+    # Uma única passada pelo texto encontra todas as ocorrências de todos os padrões,
+    # inclusive os de várias palavras ("meio ambiente", "justiça social").
+    # O autômato só é compilado na primeira busca. Registrado como índice derivado do
+    # banco, cada versão publicada do banco tem o seu.
+
+    def __init__(self, banco, campos=("gatilhos", "keywords")):
+        self.banco = banco
+        self.campos = campos
+        self.compilado = False
+
+    def compilar(self):
+        transicoes = [{}]
+        saidas = [[]]
+        padroes = {}
+        for tema, dados in self.banco.items():
+            for campo in self.campos:
+                for padrao in dados.get(campo, []):
+                    padrao = padrao.lower()
+                    if padrao:
+                        padroes.setdefault(padrao, []).append(tema)
+        for padrao in padroes:
+            estado = 0
+            for caractere in padrao:
+                if caractere not in transicoes[estado]:
+                    transicoes.append({})
+                    saidas.append([])
+                    transicoes[estado][caractere] = len(transicoes) - 1
+                estado = transicoes[estado][caractere]
+            saidas[estado].append(padrao)
+
+        falhas = [0] * len(transicoes)
+        fila = deque(transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for caractere, proximo in transicoes[estado].items():
+                fila.append(proximo)
+                falha = falhas[estado]
+                while falha and caractere not in transicoes[falha]:
+                    falha = falhas[falha]
+                falhas[proximo] = transicoes[falha].get(caractere, 0)
+                saidas[proximo] = saidas[proximo] + saidas[falhas[proximo]]
+
+        self.transicoes, self.falhas, self.saidas, self.padroes = transicoes, falhas, saidas, padroes
+        self.compilado = True
+
+    def buscar(self, texto):
+        # Devolve (início, fim, padrão, temática) para cada ocorrência, na ordem do texto
+        if not self.compilado:
+            self.compilar()
+        transicoes, falhas, saidas = self.transicoes, self.falhas, self.saidas
+        ocorrencias = []
+        estado = 0
+        for posicao, caractere in enumerate(texto.lower()):
+            while estado and caractere not in transicoes[estado]:
+                estado = falhas[estado]
+            estado = transicoes[estado].get(caractere, 0)
+            for padrao in saidas[estado]:
+                inicio = posicao - len(padrao) + 1
+                for tema in self.padroes[padrao]:
+                    ocorrencias.append((inicio, posicao + 1, padrao, tema))
+        return ocorrencias
+
+    def temas_encontrados(self, texto):
+        # Agrupa as ocorrências por temática, na ordem do banco
+        por_tema = {}
+        for ocorrencia in self.buscar(texto):
+            por_tema.setdefault(ocorrencia[3], []).append(ocorrencia)
+        return {tema: por_tema[tema] for tema in self.banco if tema in por_tema}
@@ -0,0 +1,112 @@
+import copy
+import heapq
+from bisect import bisect_left
+from collections import Counter
+
+FIM_PREFIXO = chr(0x10FFFF)
+
+
+def normalizar_termo(texto):
+    return " ".join(texto.lower().split())
+
+
+class AutocompletarTemas:
+    # Autocompletar sobre nomes de temáticas e palavras-chave do banco: um array ordenado
+    # de (chave, termo), com busca binária pelo intervalo do prefixo. Cada termo entra uma
+    # vez por início de palavra ("antirr" completa "educação antirracista"). O resultado
+    # de cada prefixo fica guardado até algum termo dentro dele mudar, então uma tecla
+    # digitada custa uma consulta a dicionário na maior parte das vezes.
+    # Popularidade: 1 + número de atividades de cada temática que usa o termo, somada
+    # às vezes em que o termo foi escolhido (registrar_uso), contadas em todas as versões.
+    # Uma instância publicada só muda o próprio cache; atualizado() monta a próxima versão.
+
+    def __init__(self, banco, limite=8, tamanho_cache=20000):
+        self.banco = banco
+        self.limite = limite
+        self.tamanho_cache = tamanho_cache
+        self.entradas = []
+        self.popularidade = Counter()
+        self.usos = Counter()
+        self.contribuicoes = {}
+        self.cache = {}
+        for tema in banco:
+            self.contribuir(tema)
+        self.entradas = sorted({(chave, termo) for termo in self.popularidade for chave in self.chaves(termo)})
+
+    def chaves(self, termo):
+        return [termo[i:] for i in range(len(termo)) if i == 0 or termo[i - 1] == " "]
+
+    def contribuir(self, tema):
+        # Atualiza a popularidade dos termos da temática e devolve os termos afetados
+        antigos = self.contribuicoes.pop(tema, {})
+        novos = {}
+        dados = self.banco.get(tema)
+        if dados is not None:
+            peso = 1 + len(dados.get("atividades", ()))
+            for termo in (tema, *dados.get("keywords", ())):
+                termo = normalizar_termo(termo)
+                if termo:
+                    novos[termo] = peso
+            self.contribuicoes[tema] = novos
+        for termo, peso in antigos.items():
+            self.popularidade[termo] -= peso
+        for termo, peso in novos.items():
+            self.popularidade[termo] += peso
+        return antigos.keys() | novos.keys()
+
+    def invalidar_termo(self, termo):
+        for chave in self.chaves(termo):
+            for i in range(1, len(chave) + 1):
+                self.cache.pop(chave[:i], None)
+
+    def atualizado(self, banco, temas):
+        novo = copy.copy(self)
+        novo.banco = banco
+        novo.entradas = list(self.entradas)
+        novo.popularidade = self.popularidade.copy()
+        novo.contribuicoes = dict(self.contribuicoes)
+        novo.cache = dict(self.cache)
+        for tema in temas:
+            novo.atualizar_tema(tema)
+        return novo
+
+    def atualizar_tema(self, tema):
+        # Reindexa só a temática alterada; fora da construção, só numa cópia feita por atualizado()
+        for termo in self.contribuir(tema):
+            presente = self.popularidade[termo] > 0
+            if not presente:
+                del self.popularidade[termo]
+            for chave in self.chaves(termo):
+                entrada = (chave, termo)
+                posicao = bisect_left(self.entradas, entrada)
+                existe = posicao < len(self.entradas) and self.entradas[posicao] == entrada
+                if presente and not existe:
+                    self.entradas.insert(posicao, entrada)
+                elif existe and not presente:
+                    del self.entradas[posicao]
+            self.invalidar_termo(termo)
+
+    def registrar_uso(self, termo):
+        termo = normalizar_termo(termo)
+        if termo in self.popularidade:
+            self.usos[termo] += 1
+            self.invalidar_termo(termo)
+
+    def pontuacao(self, termo):
+        return self.popularidade[termo] + self.usos[termo]
+
+    def completar(self, prefixo, n=None):
+        # Termos que começam (em qualquer palavra) com `prefixo`, mais populares primeiro
+        prefixo = normalizar_termo(prefixo)
+        if not prefixo:
+            return []
+        melhores = self.cache.get(prefixo)
+        if melhores is None:
+            inicio = bisect_left(self.entradas, (prefixo,))
+            fim = bisect_left(self.entradas, (prefixo + FIM_PREFIXO,), inicio)
+            termos = {termo for _, termo in self.entradas[inicio:fim]}
+            melhores = tuple(heapq.nsmallest(self.limite, termos, key=lambda t: (-self.pontuacao(t), t)))
+            if len(self.cache) >= self.tamanho_cache:
+                self.cache.clear()
+            self.cache[prefixo] = melhores
+        return list(melhores[:n])
@@ -0,0 +1,390 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+
+from icc.banco_compacto import BancoCompacto, ler_temas, normalizar_dados
+from icc.cache import nova_versao_banco
+from icc.observador import ObservadorArquivos
+from icc.trava_arquivo import TravaArquivo
+
+PATH_COLABORATIVO = Path("temas_sugeridos_colaborativos.json")
+
+# Banco semântico inicial
+BANCO_INICIAL = {
+    "educação antirracista": {
+        "keywords": ["racismo", "etnia", "afro", "discriminação", "negritude"],
+        "atividades": [
+            "Roda de conversa sobre identidade racial",
+            "Produção de murais sobre igualdade étnico-racial",
+            "Análise de livros com protagonistas negros"
+        ]
+    },
+    "inclusão e acessibilidade": {
+        "keywords": ["inclusão", "acessível", "deficiência", "libras", "diversidade funcional"],
+        "atividades": [
+            "Produção de materiais acessíveis",
+            "Oficinas de sensibilização sobre deficiência",
+            "Palestras sobre educação inclusiva"
+        ]
+    },
+    "direitos humanos": {
+        "keywords": ["direitos", "igualdade", "justiça social", "direitos civis"],
+        "atividades": [
+            "Análise de casos de violações de direitos",
+            "Campanhas de conscientização sobre direitos humanos",
+            "Simulações de tribunal de direitos humanos"
+        ]
+    },
+}
+
+
+def carregar_banco(caminho=PATH_COLABORATIVO):
+    carregado = abrir_armazenamento(caminho).carregar()
+    banco = carregado.derivar()
+    for tema, dados in BANCO_INICIAL.items():
+        banco.adicionar(tema, dados)
+    banco.temas.update(carregado.temas)
+    return banco
+
+
+def unir_bancos(*bancos):
+    # Junta bancos {tema: dados} sem que um esconda o outro: a temática que aparece em mais
+    # de um fica com a união das keywords e das atividades, na ordem em que aparecem
+    unido = {}
+    for banco in bancos:
+        for tema, dados in banco.items():
+            dados = normalizar_dados(dados)
+            atual = unido.setdefault(tema, {"keywords": {}, "atividades": {}})
+            atual["keywords"].update(dict.fromkeys(dados.get("keywords", ())))
+            atual["atividades"].update(dict.fromkeys(dados.get("atividades", ())))
+    return {
+        tema: {"keywords": list(dados["keywords"]), "atividades": list(dados["atividades"])}
+        for tema, dados in unido.items()
+    }
+
+
+def salvar_banco(banco, caminho=PATH_COLABORATIVO):
+    # Grava num arquivo temporário e troca de uma vez, para nunca deixar o JSON pela metade
+    caminho = Path(caminho)
+    temporario = caminho.with_name(caminho.name + ".tmp")
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(banco, f, indent=2, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+
+class ArmazenamentoJSON:
+    # Snapshot JSON + diário de contribuições (JSONL). Cada gravação só acrescenta uma
+    # linha por temática ao diário; a leitura aplica o diário sobre o snapshot e
+    # compactar() incorpora o diário num novo snapshot, trocado de uma vez. Gravações e
+    # compactações de todos os processos passam pela mesma trava (flock no diário).
+    # `revisao` conta as gravações: cada registro leva o número da sua e, ao compactar,
+    # o diário recomeça com uma linha {"revisao": n}, para a contagem sobreviver.
+
+    def __init__(self, caminho, limite_diario=200):
+        self.caminho = Path(caminho)
+        self.caminho_diario = self.caminho.with_suffix(".diario.jsonl")
+        self.limite_diario = limite_diario
+        self.registros_diario = 0
+        self.revisao = 0
+        self.banco = BancoCompacto()
+        self.trava = TravaArquivo(self.caminho_diario)
+
+    def assinatura(self):
+        assinatura = []
+        for caminho in (self.caminho, self.caminho_diario):
+            try:
+                estado = os.stat(caminho)
+            except FileNotFoundError:
+                assinatura.append(None)
+            else:
+                assinatura.append((estado.st_mtime_ns, estado.st_size))
+        return tuple(assinatura)
+
+    def arquivos(self):
+        return [self.caminho, self.caminho_diario]
+
+    def carregar(self):
+        # Com diário, lê sob a trava: uma compactação de outro processo no meio da leitura
+        # daria o snapshot antigo com o diário já truncado
+        if not self.caminho_diario.exists():
+            return self.ler()
+        with self.trava:
+            return self.ler()
+
+    def ler(self):
+        self.banco = BancoCompacto()
+        if self.caminho.exists():
+            for tema, dados in ler_temas(self.caminho):
+                self.banco.adicionar(tema, dados)
+        self.registros_diario = 0
+        self.revisao = 0
+        if self.caminho_diario.exists():
+            with open(self.caminho_diario, "r", encoding="utf-8") as f:
+                for linha in f:
+                    try:
+                        registro = json.loads(linha)
+                    except json.JSONDecodeError:
+                        # Linha truncada por uma queda no meio da escrita: é descartada
+                        continue
+                    if "tema" not in registro:
+                        self.revisao = registro.get("revisao", self.revisao)
+                        continue
+                    self.aplicar(registro)
+                    self.registros_diario += 1
+                    # Registros de antes da contagem valem uma revisão cada
+                    self.revisao = registro.get("revisao", self.revisao + 1)
+        return self.banco
+
+    def aplicar(self, registro):
+        if registro.get("removido"):
+            self.banco.remover(registro["tema"])
+        else:
+            self.banco.adicionar(registro["tema"], registro)
+
+    def salvar(self, alteracoes):
+        with self.trava:
+            momento = time.time()
+            self.revisao += 1
+            registros = []
+            for tema, dados in alteracoes.items():
+                if dados is None:
+                    registro = {"tema": tema, "removido": True}
+                else:
+                    registro = {
+                        "tema": tema,
+                        "keywords": dados.get("keywords", []),
+                        "atividades": dados.get("atividades", [])
+                    }
+                registro.update(momento=momento, revisao=self.revisao)
+                self.aplicar(registro)
+                registros.append(json.dumps(registro, ensure_ascii=False) + "\n")
+            self.registros_diario += len(registros)
+            if not self.diario_termina_em_linha():
+                registros.insert(0, "\n")
+            with open(self.caminho_diario, "a", encoding="utf-8") as f:
+                f.writelines(registros)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def diario_termina_em_linha(self):
+        # Depois de uma escrita interrompida, o próximo registro começa numa linha nova
+        try:
+            with open(self.caminho_diario, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b"\n"
+        except (FileNotFoundError, OSError):
+            return True
+
+    def precisa_compactar(self):
+        return self.registros_diario >= self.limite_diario
+
+    def compactar(self):
+        # Relê snapshot e diário sob a trava, para incorporar também os registros que outros
+        # processos acrescentaram, e só então troca o snapshot e trunca o diário. Os
+        # registros substituem a temática inteira, então reaplicar o diário após uma queda
+        # entre a troca do snapshot e o truncamento não altera o resultado.
+        with self.trava:
+            self.ler()
+            salvar_banco(self.banco.como_dict(), self.caminho)
+            with open(self.caminho_diario, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"revisao": self.revisao}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.registros_diario = 0
+
+
+def abrir_armazenamento(caminho):
+    if Path(caminho).suffix in (".db", ".sqlite", ".sqlite3"):
+        from icc.banco_sqlite import ArmazenamentoSQLite
+        return ArmazenamentoSQLite(caminho)
+    return ArmazenamentoJSON(caminho)
+
+
+class InstantaneoBanco(Mapping):
+    # Fotografia imutável do banco: temáticas somente leitura (EntradaCompacta, que
+    # devolve keywords e atividades em tuplas). `versao` numera as fotografias deste
+    # processo e é a chave do cache de sugestões; `revisao` é a revisão gravada do banco,
+    # a mesma em todos os processos e depois de reiniciar, para mostrar a quem usa.
+    # Os índices derivados ficam na própria fotografia, então quem lê pega banco e índices
+    # da mesma versão e nenhum dos dois muda enquanto são usados.
+    __slots__ = ("temas", "versao", "revisao", "derivados", "trava")
+
+    def __init__(self, temas, versao, revisao=0):
+        self.temas = temas
+        self.versao = versao
+        self.revisao = revisao
+        self.derivados = {}
+        self.trava = threading.Lock()
+
+    def derivado(self, nome, fabrica):
+        # Objeto construído a partir desta fotografia (ex.: índices) na primeira vez que é pedido
+        derivado = self.derivados.get(nome)
+        if derivado is None:
+            with self.trava:
+                derivado = self.derivados.get(nome)
+                if derivado is None:
+                    derivado = self.derivados[nome] = fabrica(self)
+        return derivado
+
+    def __getitem__(self, tema):
+        return self.temas[tema]
+
+    def __iter__(self):
+        return iter(self.temas)
+
+    def __len__(self):
+        return len(self.temas)
+
+
+class ServicoBanco:
+    # Mantém uma única cópia do banco por processo do servidor, compartilhada por
+    # todas as sessões. Leitores recebem um InstantaneoBanco e não usam trava; cada
+    # gravação monta uma nova fotografia (cópia rasa, as temáticas não alteradas são
+    # reaproveitadas) e a publica de uma vez, com cópias atualizadas dos índices derivados.
+    # Com observar(), mudanças feitas por outros processos são recarregadas em segundo
+    # plano e obter() deixa de consultar o armazenamento a cada chamada.
+
+    def __init__(self, caminho, banco_inicial=None):
+        self.caminho = Path(caminho)
+        self.armazenamento = abrir_armazenamento(caminho)
+        self.banco_inicial = banco_inicial or {}
+        self.trava = threading.RLock()
+        self.assinatura = None
+        self.banco = None
+        self.instantaneo = None
+        self.observador = None
+
+    def observar(self, intervalo=0.5):
+        with self.trava:
+            if self.observador is None or not self.observador.ativo():
+                self.observador = ObservadorArquivos(
+                    self.armazenamento.arquivos(), self.ao_mudar, self.armazenamento.assinatura, intervalo
+                ).iniciar()
+            return self.observador
+
+    def ao_mudar(self):
+        # Chamado pelo observador: recarrega o banco, descarta os índices derivados e publica
+        # uma nova versão (o que invalida as sugestões em cache) antes de alguém pedir
+        try:
+            with self.trava:
+                self.recarregar_se_mudou()
+        except (OSError, ValueError):
+            # Arquivo pela metade, gravado por outro programa: o próximo obter() tenta de novo
+            self.assinatura = None
+
+    def em_dia(self):
+        if self.observador is not None and self.observador.ativo():
+            return self.assinatura is not None
+        return self.armazenamento.assinatura() == self.assinatura
+
+    def recarregar_se_mudou(self):
+        assinatura = self.armazenamento.assinatura()
+        if self.banco is not None and assinatura == self.assinatura:
+            return
+        # As temáticas gravadas substituem as iniciais de mesmo nome, mantendo a ordem
+        carregado = self.armazenamento.carregar()
+        banco = carregado.derivar()
+        for tema, dados in self.banco_inicial.items():
+            banco.adicionar(tema, dados)
+        banco.temas.update(carregado.temas)
+        self.banco = banco
+        self.assinatura = assinatura
+        self.publicar()
+
+    def publicar(self, derivados=None, temas_alterados=()):
+        # self.banco só é alterado sob a trava; os leitores ficam com a cópia publicada, que
+        # nunca muda depois de criada. Dos índices em `derivados` (os da fotografia anterior),
+        # os que têm atualizado() passam para a nova com só `temas_alterados` reindexadas;
+        # os demais são reconstruídos a partir da nova quando forem pedidos.
+        instantaneo = InstantaneoBanco(
+            MappingProxyType(dict(self.banco.temas)), nova_versao_banco(self.caminho), self.armazenamento.revisao
+        )
+        for nome, derivado in dict(derivados or {}).items():
+            if hasattr(derivado, "atualizado"):
+                instantaneo.derivados[nome] = derivado.atualizado(instantaneo, temas_alterados)
+        self.instantaneo = instantaneo
+
+    def obter(self):
+        instantaneo = self.instantaneo
+        if instantaneo is not None and self.em_dia():
+            return instantaneo
+        with self.trava:
+            self.recarregar_se_mudou()
+            return self.instantaneo
+
+    def derivado(self, nome, fabrica):
+        # Índice da fotografia atual; quem também lê o banco deve pegar os dois do mesmo
+        # instantâneo: banco = servico.obter(); indice = banco.derivado(nome, fabrica)
+        return self.obter().derivado(nome, fabrica)
+
+    def salvar(self, alteracoes, atualizar_derivados=True):
+        # alteracoes: {tema: dados}; dados None remove a temática. Importações em lote passam
+        # atualizar_derivados=False: a nova fotografia começa sem índices, que só são
+        # construídos a partir dela se alguém os pedir. Como cada fotografia tem versão
+        # própria, sugestões em cache de fotografias anteriores nunca valem para ela.
+        alteracoes = {
+            tema: None if dados is None else normalizar_dados(dados)
+            for tema, dados in alteracoes.items()
+        }
+        with self.trava, self.armazenamento.trava:
+            self.recarregar_se_mudou()
+            self.armazenamento.salvar(alteracoes)
+            for tema, dados in alteracoes.items():
+                if dados is None:
+                    self.banco.remover(tema)
+                else:
+                    self.banco.adicionar(tema, dados)
+            # Sob a trava do armazenamento nenhum outro processo gravou desde a recarga,
+            # então a assinatura nova corresponde só a esta gravação
+            self.assinatura = self.armazenamento.assinatura()
+            if self.armazenamento.precisa_compactar():
+                threading.Thread(target=self.compactar, daemon=True).start()
+            self.publicar(self.instantaneo.derivados if atualizar_derivados else None, alteracoes)
+            return self.instantaneo
+
+    def valor_atual(self, tema):
+        dados = self.banco.get(tema)
+        if dados is None:
+            return None
+        return tuple(dados["keywords"]), tuple(dados["atividades"])
+
+    def salvar_se_inalterado(self, alteracoes, esperados):
+        # Controle otimista para edições concorrentes: `esperados` traz, por temática, o
+        # (keywords, atividades) que o curador viu, ou None se ela não existia. Temáticas
+        # alteradas por outra pessoa nesse meio-tempo não são gravadas e voltam como conflito.
+        with self.trava, self.armazenamento.trava:
+            self.recarregar_se_mudou()
+            conflitos = [tema for tema in alteracoes if self.valor_atual(tema) != esperados.get(tema)]
+            aplicaveis = {tema: dados for tema, dados in alteracoes.items() if tema not in conflitos}
+            if aplicaveis:
+                self.salvar(aplicaveis)
+            return conflitos
+
+    def compactar(self):
+        # Roda em segundo plano; várias gravações seguidas podem ter disparado a mesma compactação.
+        # Recarrega antes para que o banco em memória também tenha o que outros processos gravaram.
+        with self.trava, self.armazenamento.trava:
+            self.recarregar_se_mudou()
+            if not self.armazenamento.precisa_compactar():
+                return
+            self.armazenamento.compactar()
+            self.assinatura = self.armazenamento.assinatura()
+
+
+_servicos = {}
+_trava_servicos = threading.Lock()
+
+
+def servico_banco(caminho=PATH_COLABORATIVO, banco_inicial=None, observar=True):
+    # Um serviço por arquivo e por processo; banco_inicial e observar só valem na primeira chamada
+    with _trava_servicos:
+        chave = str(Path(caminho).resolve())
+        if chave not in _servicos:
+            _servicos[chave] = ServicoBanco(caminho, banco_inicial)
+            if observar:
+                _servicos[chave].observar()
+        return _servicos[chave]
@@ -0,0 +1,169 @@
+import json
+import sys
+from array import array
+from collections.abc import Mapping
+
+TAMANHO_BLOCO_LEITURA = 1 << 16
+
+
+def normalizar_dados(dados):
+    # Entradas gravadas pelas telas de curadoria guardam só a lista de atividades
+    if isinstance(dados, Mapping):
+        return dados
+    return {"keywords": [], "atividades": list(dados)}
+
+
+def ler_temas(caminho):
+    # Lê um arquivo {tema: dados} temática a temática, sem montar o dicionário inteiro.
+    # Aceita os dois formatos históricos (lista de atividades ou keywords/atividades),
+    # inclusive misturados no mesmo arquivo. `caminho` também pode ser um arquivo de texto aberto.
+    if hasattr(caminho, "read"):
+        yield from _ler_temas(caminho, getattr(caminho, "name", "arquivo"))
+    else:
+        with open(caminho, "r", encoding="utf-8") as f:
+            yield from _ler_temas(f, caminho)
+
+
+def _ler_temas(f, caminho):
+    decodificador = json.JSONDecoder()
+    texto = ""
+    posicao = 0
+    fim_arquivo = False
+
+    def ler_mais():
+        nonlocal texto, posicao, fim_arquivo
+        if fim_arquivo:
+            raise ValueError(f"{caminho}: fim inesperado do arquivo")
+        bloco = f.read(TAMANHO_BLOCO_LEITURA)
+        fim_arquivo = not bloco
+        texto = texto[posicao:] + bloco
+        posicao = 0
+
+    def espiar():
+        # Próximo caractere significativo, sem consumi-lo
+        nonlocal posicao
+        while True:
+            while posicao < len(texto) and texto[posicao] in " \t\r\n":
+                posicao += 1
+            if posicao < len(texto):
+                return texto[posicao]
+            ler_mais()
+
+    def simbolo(esperados):
+        nonlocal posicao
+        caractere = espiar()
+        if caractere not in esperados:
+            raise ValueError(f"{caminho}: esperado um de {esperados!r}, encontrado {caractere!r}")
+        posicao += 1
+        return caractere
+
+    def valor():
+        # raw_decode falha se o valor ainda não chegou inteiro; lê mais e tenta de novo
+        nonlocal posicao
+        espiar()
+        while True:
+            try:
+                resultado, fim = decodificador.raw_decode(texto, posicao)
+            except json.JSONDecodeError:
+                if fim_arquivo:
+                    raise
+            else:
+                # Um número no fim do bloco pode estar cortado; só confia se houver mais texto
+                if fim < len(texto) or fim_arquivo:
+                    posicao = fim
+                    return resultado
+            ler_mais()
+
+    simbolo("{")
+    if espiar() == "}":
+        return
+    while True:
+        tema = valor()
+        simbolo(":")
+        yield tema, normalizar_dados(valor())
+        if simbolo(",}") == "}":
+            return
+
+
+class EntradaCompacta(Mapping):
+    # Dados de uma temática guardados como arrays de IDs da tabela de textos do banco
+    __slots__ = ("textos", "ids_keywords", "ids_atividades")
+
+    def __init__(self, textos, ids_keywords, ids_atividades):
+        self.textos = textos
+        self.ids_keywords = ids_keywords
+        self.ids_atividades = ids_atividades
+
+    def __getitem__(self, chave):
+        if chave == "keywords":
+            ids = self.ids_keywords
+        elif chave == "atividades":
+            ids = self.ids_atividades
+        else:
+            raise KeyError(chave)
+        textos = self.textos
+        return tuple([textos[i] for i in ids])
+
+    def __iter__(self):
+        return iter(("keywords", "atividades"))
+
+    def __len__(self):
+        return 2
+
+
+class BancoCompacto(Mapping):
+    # Banco semântico em forma compacta: cada texto (keyword ou atividade) é internado e
+    # guardado uma única vez numa tabela só de acréscimos; cada temática guarda apenas
+    # arrays de IDs. Textos repetidos entre temáticas e arquivos não ocupam memória extra.
+
+    def __init__(self, banco=None):
+        self.textos = []
+        self.ids = {}
+        self.temas = {}
+        if banco is not None:
+            for tema, dados in banco.items():
+                self.adicionar(tema, dados)
+
+    def id_texto(self, texto):
+        id_ = self.ids.get(texto)
+        if id_ is None:
+            texto = sys.intern(texto)
+            id_ = len(self.textos)
+            self.textos.append(texto)
+            self.ids[texto] = id_
+        return id_
+
+    def derivar(self):
+        # Banco vazio que compartilha a tabela de textos (e, portanto, as entradas) deste
+        novo = BancoCompacto()
+        novo.textos = self.textos
+        novo.ids = self.ids
+        return novo
+
+    def adicionar(self, tema, dados):
+        # Substitui a temática inteira
+        dados = normalizar_dados(dados)
+        self.temas[sys.intern(tema)] = EntradaCompacta(
+            self.textos,
+            array("I", dict.fromkeys(map(self.id_texto, dados.get("keywords", ())))),
+            array("I", dict.fromkeys(map(self.id_texto, dados.get("atividades", ()))))
+        )
+
+    def remover(self, tema):
+        self.temas.pop(tema, None)
+
+    def como_dict(self):
+        return {
+            tema: {"keywords": list(dados["keywords"]), "atividades": list(dados["atividades"])}
+            for tema, dados in self.temas.items()
+        }
+
+    def __getitem__(self, tema):
+        return self.temas[tema]
+
+    def __iter__(self):
+        return iter(self.temas)
+
+    def __len__(self):
+        return len(self.temas)
+
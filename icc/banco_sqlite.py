@@ -0,0 +1,125 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+from icc.banco_compacto import BancoCompacto, normalizar_dados
+from icc.trava_arquivo import TravaArquivo
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS temas (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    tema_id INTEGER NOT NULL REFERENCES temas(id) ON DELETE CASCADE,
+    posicao INTEGER NOT NULL,
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (tema_id, posicao)
+);
+CREATE INDEX IF NOT EXISTS idx_keywords_keyword ON keywords(keyword);
+CREATE TABLE IF NOT EXISTS atividades (
+    tema_id INTEGER NOT NULL REFERENCES temas(id) ON DELETE CASCADE,
+    posicao INTEGER NOT NULL,
+    texto TEXT NOT NULL,
+    PRIMARY KEY (tema_id, posicao)
+);
+CREATE INDEX IF NOT EXISTS idx_atividades_texto ON atividades(texto);
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (chave, valor) VALUES ('versao', 0);
+"""
+
+
+class ArmazenamentoSQLite:
+    # Banco semântico em SQLite (modo WAL): cada gravação só toca as linhas das
+    # temáticas alteradas, em vez de reescrever o arquivo inteiro. A trava entre processos
+    # usa um arquivo à parte: fechar um descritor do próprio banco soltaria as travas do SQLite.
+
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+        self.local = threading.local()
+        self.trava = TravaArquivo(self.caminho.with_name(self.caminho.name + ".trava"))
+        # meta.versao, incrementada a cada gravação, é a revisão do banco
+        self.revisao = 0
+        self.conexao().executescript(ESQUEMA)
+
+    def conexao(self):
+        if not hasattr(self.local, "conexao"):
+            conexao = sqlite3.connect(self.caminho, isolation_level=None, timeout=30)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            conexao.execute("PRAGMA foreign_keys=ON")
+            self.local.conexao = conexao
+        return self.local.conexao
+
+    def transacao(self):
+        return _Transacao(self.conexao())
+
+    def assinatura(self):
+        return self.conexao().execute("SELECT valor FROM meta WHERE chave = 'versao'").fetchone()[0]
+
+    def arquivos(self):
+        # Em modo WAL as gravações de outros processos chegam primeiro ao arquivo -wal
+        return [self.caminho, self.caminho.with_name(self.caminho.name + "-wal")]
+
+    def carregar(self):
+        # Numa única transação de leitura, para a revisão corresponder às linhas lidas
+        conexao = self.conexao()
+        banco = {}
+        nomes = {}
+        conexao.execute("BEGIN")
+        try:
+            self.revisao = self.assinatura()
+            for tema_id, nome in conexao.execute("SELECT id, nome FROM temas ORDER BY id"):
+                banco[nome] = {"keywords": [], "atividades": []}
+                nomes[tema_id] = nome
+            for tema_id, keyword in conexao.execute("SELECT tema_id, keyword FROM keywords ORDER BY tema_id, posicao"):
+                banco[nomes[tema_id]]["keywords"].append(keyword)
+            for tema_id, texto in conexao.execute("SELECT tema_id, texto FROM atividades ORDER BY tema_id, posicao"):
+                banco[nomes[tema_id]]["atividades"].append(texto)
+        finally:
+            conexao.execute("COMMIT")
+        return BancoCompacto(banco)
+
+    def salvar(self, alteracoes):
+        # alteracoes: {tema: dados}; dados None remove a temática
+        with self.trava, self.transacao() as conexao:
+            for tema, dados in alteracoes.items():
+                if dados is None:
+                    conexao.execute("DELETE FROM temas WHERE nome = ?", (tema,))
+                    continue
+                conexao.execute("INSERT OR IGNORE INTO temas (nome) VALUES (?)", (tema,))
+                tema_id = conexao.execute("SELECT id FROM temas WHERE nome = ?", (tema,)).fetchone()[0]
+                dados = normalizar_dados(dados)
+                conexao.execute("DELETE FROM keywords WHERE tema_id = ?", (tema_id,))
+                conexao.execute("DELETE FROM atividades WHERE tema_id = ?", (tema_id,))
+                conexao.executemany(
+                    "INSERT INTO keywords (tema_id, posicao, keyword) VALUES (?, ?, ?)",
+                    [(tema_id, i, k) for i, k in enumerate(dados.get("keywords", []))]
+                )
+                conexao.executemany(
+                    "INSERT INTO atividades (tema_id, posicao, texto) VALUES (?, ?, ?)",
+                    [(tema_id, i, a) for i, a in enumerate(dados.get("atividades", []))]
+                )
+            conexao.execute("UPDATE meta SET valor = valor + 1 WHERE chave = 'versao'")
+            self.revisao = conexao.execute("SELECT valor FROM meta WHERE chave = 'versao'").fetchone()[0]
+
+    def precisa_compactar(self):
+        # O SQLite grava no lugar; não há diário a incorporar
+        return False
+
+
+class _Transacao:
+    # BEGIN IMMEDIATE reserva a escrita já no início, evitando conflitos entre sessões
+    def __init__(self, conexao):
+        self.conexao = conexao
+
+    def __enter__(self):
+        self.conexao.execute("BEGIN IMMEDIATE")
+        return self.conexao
+
+    def __exit__(self, tipo, valor, rastreamento):
+        self.conexao.execute("ROLLBACK" if tipo else "COMMIT")
+        return False
@@ -0,0 +1,99 @@
+from collections import Counter
+from collections.abc import Mapping
+
+import numpy as np
+from scipy import sparse
+
+from icc.indice_invertido import tokenizar
+
+PALAVRAS_VAZIAS = {
+    "a", "o", "as", "os", "e", "de", "da", "do", "das", "dos", "em", "na", "no", "nas", "nos",
+    "para", "por", "com", "sobre", "um", "uma", "ao", "à", "que"
+}
+
+
+def texto_do_tema(tema, dados):
+    # Nome e palavras-chave contam em dobro em relação ao texto das atividades
+    if isinstance(dados, Mapping):
+        keywords, atividades = dados.get("keywords", []), dados.get("atividades", [])
+    else:
+        keywords, atividades = [], dados
+    return " ".join([tema, tema, *keywords, *keywords, *atividades])
+
+
+def atividades_do_tema(dados):
+    return dados.get("atividades", []) if isinstance(dados, Mapping) else dados
+
+
+def termos(texto):
+    return [t for t in tokenizar(texto) if t not in PALAVRAS_VAZIAS]
+
+
+class BuscadorBM25:
+    # Recuperação ranqueada por BM25 sobre as temáticas do banco semântico.
+    # Os pesos BM25 ficam numa matriz esparsa (termos x temáticas); uma consulta só
+    # soma as linhas dos seus próprios termos, então o custo acompanha o tamanho
+    # das listas de ocorrência desses termos e não o tamanho do banco.
+
+    def __init__(self, banco, k1=1.5, b=0.75, peso_impacto=0.3):
+        self.banco = banco
+        self.k1 = k1
+        self.b = b
+        self.peso_impacto = peso_impacto
+        self.compilado = False
+
+    def compilar(self):
+        self.temas = list(self.banco)
+        self.vocabulario = {}
+        linhas, colunas, frequencias, tamanhos = [], [], [], []
+        for coluna, tema in enumerate(self.temas):
+            contagem = Counter(termos(texto_do_tema(tema, self.banco[tema])))
+            tamanhos.append(sum(contagem.values()))
+            for termo, frequencia in contagem.items():
+                linhas.append(self.vocabulario.setdefault(termo, len(self.vocabulario)))
+                colunas.append(coluna)
+                frequencias.append(frequencia)
+
+        linhas = np.asarray(linhas, dtype=np.intp)
+        colunas = np.asarray(colunas, dtype=np.intp)
+        frequencias = np.asarray(frequencias, dtype=float)
+        tamanhos = np.asarray(tamanhos, dtype=float)
+        n_temas = len(self.temas)
+        docs_por_termo = np.bincount(linhas, minlength=len(self.vocabulario))
+        idf = np.log1p((n_temas - docs_por_termo + 0.5) / (docs_por_termo + 0.5))
+        normalizacao = self.k1 * (1 - self.b + self.b * tamanhos / (tamanhos.mean() if n_temas else 1.0))
+        pesos = idf[linhas] * frequencias * (self.k1 + 1) / (frequencias + normalizacao[colunas])
+
+        self.matriz = sparse.csr_matrix((pesos, (linhas, colunas)), shape=(len(self.vocabulario), n_temas))
+        self.compilado = True
+
+    def ranquear_temas(self, texto, limite=10):
+        # Devolve [(temática, pontuação BM25)] em ordem decrescente
+        if not self.compilado:
+            self.compilar()
+        contagem = Counter(t for t in termos(texto) if t in self.vocabulario)
+        if not contagem:
+            return []
+        ids = [self.vocabulario[t] for t in contagem]
+        consulta = np.fromiter(contagem.values(), dtype=float)
+        pontuacoes = (sparse.csr_matrix(consulta) @ self.matriz[ids]).tocoo()
+        ordem = np.argsort(-pontuacoes.data, kind="stable")[:limite]
+        return [(self.temas[pontuacoes.col[i]], float(pontuacoes.data[i])) for i in ordem]
+
+    def ranquear_atividades(self, texto, impacto=None, limite_temas=10):
+        # Devolve [(temática, atividade, relevância, impacto, pontuação)], com a relevância
+        # normalizada pelo melhor tema e misturada ao impacto estimado de cada atividade
+        impacto = impacto or {}
+        temas = self.ranquear_temas(texto, limite_temas)
+        if not temas:
+            return []
+        melhor = temas[0][1]
+        resultados = {}
+        for tema, pontuacao in temas:
+            relevancia = pontuacao / melhor
+            for atividade in atividades_do_tema(self.banco[tema]):
+                impacto_atividade = impacto.get(atividade, 0.5)
+                final = (1 - self.peso_impacto) * relevancia + self.peso_impacto * impacto_atividade
+                if atividade not in resultados or final > resultados[atividade][4]:
+                    resultados[atividade] = (tema, atividade, relevancia, impacto_atividade, final)
+        return sorted(resultados.values(), key=lambda r: r[4], reverse=True)
@@ -0,0 +1,66 @@
+import threading
+from collections import Counter, OrderedDict
+
+from icc.indice_invertido import tokenizar
+
+
+class CacheLRU:
+    # Cache LRU limitado e seguro entre threads. Vive no módulo importado, então é
+    # compartilhado por todas as sessões e sobrevive às reexecuções do Streamlit.
+
+    def __init__(self, tamanho_maximo=4096):
+        self.tamanho_maximo = tamanho_maximo
+        self.itens = OrderedDict()
+        self.trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave, calcular):
+        with self.trava:
+            if chave in self.itens:
+                self.itens.move_to_end(chave)
+                self.acertos += 1
+                return self.itens[chave]
+            self.falhas += 1
+        valor = calcular()
+        with self.trava:
+            self.itens[chave] = valor
+            self.itens.move_to_end(chave)
+            while len(self.itens) > self.tamanho_maximo:
+                self.itens.popitem(last=False)
+        return valor
+
+    def limpar(self):
+        with self.trava:
+            self.itens.clear()
+
+    def estatisticas(self):
+        with self.trava:
+            return {"acertos": self.acertos, "falhas": self.falhas, "tamanho": len(self.itens)}
+
+
+cache_sugestoes = CacheLRU()
+versoes_banco = Counter()
+
+
+def normalizar_tema(texto):
+    return " ".join(tokenizar(texto))
+
+
+def versao_banco(banco):
+    return versoes_banco[str(banco)]
+
+
+def nova_versao_banco(banco):
+    # Chamar sempre que o banco identificado por `banco` (em geral, o caminho do arquivo) mudar
+    versoes_banco[str(banco)] += 1
+    return versoes_banco[str(banco)]
+
+
+def sugestoes_em_cache(banco, consulta, tema, calcular, versao=None):
+    # `calcular` recebe o tema normalizado e deve devolver um valor imutável (ex.: tupla).
+    # `versao` é a do InstantaneoBanco de onde vêm os índices usados por `calcular`; sem
+    # ela vale a versão atual de `banco`, que pode já ser mais nova que esses índices.
+    tema = normalizar_tema(tema)
+    chave = (str(banco), consulta, versao_banco(banco) if versao is None else versao, tema)
+    return cache_sugestoes.obter(chave, lambda: calcular(tema))
@@ -0,0 +1,212 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+from icc.banco import PATH_COLABORATIVO, carregar_banco, servico_banco
+from icc.deduplicacao import deduplicar_atividades
+from icc.importacao import TAMANHO_LOTE_IMPORTACAO, importar_arquivo
+from icc.indice_invertido import IndiceInvertido
+from icc.pontuacao import CRITERIOS, ESCALA_NOTAS, calcular_icc_lote
+
+TAMANHO_LOTE = 1024
+COLUNAS_NOTAS = [f"nota_{i}" for i in range(1, len(CRITERIOS) + 1)]
+COLUNAS_PESOS = [f"peso_{i}" for i in range(1, len(CRITERIOS) + 1)]
+COLUNAS_SAIDA = ["nome", "tema", "icc", "interpretacao", "atividades"]
+
+
+def ler_avaliacoes(arquivo):
+    # Cada linha tem nome, tema, nota_1..nota_11 e, opcionalmente, peso_1..peso_11 (padrão 1.0)
+    leitor = csv.DictReader(arquivo)
+    for numero_linha, linha in enumerate(leitor, start=2):
+        try:
+            notas = [int(linha[c]) for c in COLUNAS_NOTAS]
+            pesos = [float(linha.get(c) or 1.0) for c in COLUNAS_PESOS]
+        except (KeyError, TypeError, ValueError) as erro:
+            yield numero_linha, None, f"valor ausente ou inválido ({erro})"
+            continue
+        if any(n not in ESCALA_NOTAS for n in notas):
+            yield numero_linha, None, "as notas devem estar entre 1 e 4"
+        elif sum(pesos) <= 0:
+            yield numero_linha, None, "a soma dos pesos deve ser positiva"
+        else:
+            yield numero_linha, (linha.get("nome", ""), linha.get("tema", ""), notas, pesos), None
+
+
+def avaliacoes_validas(arquivo, contagem):
+    # Repassa só as linhas válidas; as demais são relatadas na saída de erro e contadas
+    for numero_linha, avaliacao, erro in ler_avaliacoes(arquivo):
+        if erro:
+            contagem["ignoradas"] += 1
+            print(f"Linha {numero_linha} ignorada: {erro}", file=sys.stderr)
+        else:
+            yield avaliacao
+
+
+class EscritorCSV:
+    def __init__(self, saida):
+        self.escritor = csv.DictWriter(saida, fieldnames=COLUNAS_SAIDA)
+        self.escritor.writeheader()
+
+    def escrever(self, resultado):
+        self.escritor.writerow(dict(resultado, atividades="; ".join(resultado["atividades"])))
+
+
+class EscritorJSONL:
+    def __init__(self, saida):
+        self.saida = saida
+
+    def escrever(self, resultado):
+        self.saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+
+
+ESCRITORES = {"csv": EscritorCSV, "jsonl": EscritorJSONL}
+
+
+def pontuar(entrada, saida, formato, indice_semantico, tamanho_lote=TAMANHO_LOTE):
+    escritor = ESCRITORES[formato](saida)
+    contagem = {"pontuadas": 0, "ignoradas": 0}
+    lote = []
+
+    def processar_lote():
+        icc, interpretacoes = calcular_icc_lote([a[2] for a in lote], [a[3] for a in lote])
+        for (nome, tema, _, _), valor, interpretacao in zip(lote, icc, interpretacoes):
+            escritor.escrever({
+                "nome": nome,
+                "tema": tema,
+                "icc": round(float(valor), 3),
+                "interpretacao": interpretacao,
+                "atividades": indice_semantico.encontrar_atividades(tema)
+            })
+        contagem["pontuadas"] += len(lote)
+
+    for avaliacao in avaliacoes_validas(entrada, contagem):
+        lote.append(avaliacao)
+        if len(lote) == tamanho_lote:
+            processar_lote()
+            lote = []
+    if lote:
+        processar_lote()
+    return contagem
+
+
+def comando_pontuar(args):
+    formato = args.formato or ("jsonl" if args.saida and Path(args.saida).suffix == ".jsonl" else "csv")
+    indice_semantico = IndiceInvertido(carregar_banco(args.banco))
+    with open(args.entrada, "r", encoding="utf-8", newline="") as entrada:
+        if args.saida:
+            with open(args.saida, "w", encoding="utf-8", newline="") as saida:
+                contagem = pontuar(entrada, saida, formato, indice_semantico)
+        else:
+            contagem = pontuar(entrada, sys.stdout, formato, indice_semantico)
+    print(f"{contagem['pontuadas']} avaliações pontuadas, {contagem['ignoradas']} linhas ignoradas.", file=sys.stderr)
+    return 1 if contagem["ignoradas"] else 0
+
+
+def comando_relatorios(args):
+    # Importado aqui para que a pontuação não dependa de fpdf
+    from icc.relatorios_lote import gerar_relatorios
+
+    indice_semantico = IndiceInvertido(carregar_banco(args.banco))
+    contagem = {"ignoradas": 0}
+    with open(args.entrada, "r", encoding="utf-8", newline="") as entrada:
+        tarefas = (
+            (indice, nome, tema, dict(zip(CRITERIOS, notas)), dict(zip(CRITERIOS, pesos)), indice_semantico.encontrar_atividades(tema))
+            for indice, (nome, tema, notas, pesos) in enumerate(avaliacoes_validas(entrada, contagem), start=1)
+        )
+        total, segundos = gerar_relatorios(
+            tarefas, args.destino, args.trabalhadores,
+            progresso=lambda total: print(f"\r{total} relatórios gerados...", end="", file=sys.stderr)
+        )
+    print(file=sys.stderr)
+    print(
+        f"{total} relatórios gerados em {segundos:.1f}s "
+        f"({total / segundos if segundos else 0:.1f} relatórios/s, {args.trabalhadores or os.cpu_count()} processos); "
+        f"{contagem['ignoradas']} linhas ignoradas.",
+        file=sys.stderr
+    )
+    return 1 if contagem["ignoradas"] else 0
+
+
+def comando_importar(args):
+    servico = servico_banco(args.destino)
+    total = Counter()
+
+    def progresso(contagem):
+        print(f"\r{contagem['linhas']} registros lidos, {contagem['temas']} temáticas gravadas...", end="", file=sys.stderr)
+
+    def erros(linha, mensagem):
+        print(f"\nRegistro {linha} ignorado: {mensagem}", file=sys.stderr)
+
+    def parecidas(tema, atividade, presente, similaridade):
+        print(f"\n{tema}\t{atividade}\t~ {presente}\t{similaridade:.2f}", file=sys.stderr)
+
+    for caminho in args.arquivos:
+        with open(caminho, "rb") as arquivo:
+            total += importar_arquivo(servico, arquivo, caminho, args.lote, progresso, erros, parecidas)
+    print(
+        f"\n{total['atividades']} atividades novas em {total['temas']} gravações de temáticas "
+        f"({total['parecidas']} parecidas com outras já cadastradas, para revisar); "
+        f"{total['duplicatas']} repetições e {total['ignoradas']} registros inválidos ignorados.",
+        file=sys.stderr
+    )
+    return 1 if total["ignoradas"] else 0
+
+
+def comando_deduplicar(args):
+    servico = servico_banco(args.banco)
+    alteracoes = {}
+    total = 0
+    for tema, dados in servico.obter().items():
+        mantidas, duplicatas = deduplicar_atividades(dados["atividades"], args.limiar)
+        for descartada, mantida, similaridade in duplicatas:
+            print(f"{tema}\t{descartada}\t~ {mantida}\t{similaridade:.2f}")
+        if duplicatas:
+            alteracoes[tema] = {"keywords": dados["keywords"], "atividades": mantidas}
+            total += len(duplicatas)
+    if args.aplicar and alteracoes:
+        servico.salvar(alteracoes)
+    acao = "removidas" if args.aplicar else "encontradas (use --aplicar para remover)"
+    print(f"{total} atividades quase duplicadas {acao} em {len(alteracoes)} temáticas.", file=sys.stderr)
+    return 0
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog="python -m icc", description="Ferramentas de linha de comando do ICC.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    p_pontuar = subparsers.add_parser("pontuar", aliases=["score"], help="Calcula o ICC de um CSV de avaliações.")
+    p_pontuar.add_argument("entrada", help="CSV com nome, tema, nota_1..nota_11 e peso_1..peso_11.")
+    p_pontuar.add_argument("-o", "--saida", help="Arquivo de saída (padrão: saída padrão).")
+    p_pontuar.add_argument("-f", "--formato", choices=sorted(ESCRITORES), help="Formato da saída (padrão: pela extensão ou csv).")
+    p_pontuar.add_argument("--banco", default=PATH_COLABORATIVO, help="Banco semântico usado nas sugestões de atividades.")
+    p_pontuar.set_defaults(func=comando_pontuar)
+
+    p_relatorios = subparsers.add_parser("relatorios", aliases=["reports"], help="Gera um relatório PDF por avaliação do CSV.")
+    p_relatorios.add_argument("entrada", help="CSV no mesmo formato do comando pontuar.")
+    p_relatorios.add_argument("destino", help="Pasta para os PDFs ou arquivo .zip único.")
+    p_relatorios.add_argument("-j", "--trabalhadores", type=int, help="Número de processos (padrão: número de CPUs).")
+    p_relatorios.add_argument("--banco", default=PATH_COLABORATIVO, help="Banco semântico usado nas sugestões de atividades.")
+    p_relatorios.set_defaults(func=comando_relatorios)
+
+    p_importar = subparsers.add_parser("importar", aliases=["import"], help="Importa temáticas e atividades em massa de arquivos CSV ou JSON.")
+    p_importar.add_argument("destino", help="Banco semântico de destino (.json ou .db).")
+    p_importar.add_argument("arquivos", nargs="+", help="CSV (tema, keywords, atividade/atividades) ou JSON em qualquer formato de banco.")
+    p_importar.add_argument("--lote", type=int, default=TAMANHO_LOTE_IMPORTACAO, help="Temáticas gravadas por lote (padrão: %(default)s).")
+    p_importar.set_defaults(func=comando_importar)
+
+    p_deduplicar = subparsers.add_parser("deduplicar", aliases=["dedup"], help="Encontra atividades quase duplicadas em cada temática do banco.")
+    p_deduplicar.add_argument("banco", nargs="?", default=PATH_COLABORATIVO, help="Banco semântico (.json ou .db).")
+    p_deduplicar.add_argument("--limiar", type=float, default=0.65, help="Similaridade de Jaccard mínima entre trigramas (padrão: 0.65).")
+    p_deduplicar.add_argument("--aplicar", action="store_true", help="Grava o banco sem as duplicatas, mantendo a primeira ocorrência.")
+    p_deduplicar.set_defaults(func=comando_deduplicar)
+
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    return args.func(args)
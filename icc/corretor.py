@@ -0,0 +1,110 @@
+import copy
+from collections import Counter
+from collections.abc import Mapping
+
+from icc.indice_invertido import tokenizar
+from icc.mapa_conjuntos import MapaConjuntos
+
+
+def distancia_edicao(a, b, maximo):
+    # Distância de Damerau-Levenshtein restrita (transposições adjacentes), com corte em `maximo`
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    anterior2 = None
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        atual = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            custo = a[i - 1] != b[j - 1]
+            atual[j] = min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + custo)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                atual[j] = min(atual[j], anterior2[j - 2] + 1)
+        if min(atual) > maximo:
+            return maximo + 1
+        anterior2, anterior = anterior, atual
+    return anterior[-1]
+
+
+def termos_do_tema(tema, dados):
+    # Aceita tanto {tema: {"keywords": [...], "atividades": [...]}} quanto {tema: [atividades]}
+    keywords = dados.get("keywords", []) if isinstance(dados, Mapping) else []
+    return [palavra for texto in [tema, *keywords] for palavra in tokenizar(texto)]
+
+
+class CorretorOrtografico:
+    # Corretor no estilo SymSpell: cada palavra do vocabulário (nomes de temáticas e
+    # palavras-chave) é indexada por todas as variantes obtidas apagando até
+    # `distancia_maxima` letras do seu prefixo. Corrigir uma palavra só exige gerar as
+    # deleções dela e consultar o dicionário, sem percorrer o vocabulário. Como em
+    # IndiceInvertido, uma instância publicada não muda; atualizado() faz a próxima.
+
+    def __init__(self, banco, distancia_maxima=2, tamanho_prefixo=7):
+        self.banco = banco
+        self.distancia_maxima = distancia_maxima
+        self.tamanho_prefixo = tamanho_prefixo
+        self.frequencias = Counter()
+        self.delecoes = MapaConjuntos()
+        self.termos_por_tema = {}
+        for tema in banco:
+            self.atualizar_tema(tema)
+
+    def gerar_delecoes(self, palavra, distancia):
+        palavra = palavra[:self.tamanho_prefixo]
+        resultado = {palavra}
+        fronteira = {palavra}
+        for _ in range(distancia):
+            fronteira = {p[:i] + p[i + 1:] for p in fronteira for i in range(len(p))}
+            resultado |= fronteira
+        return resultado
+
+    def adicionar_palavra(self, palavra):
+        self.frequencias[palavra] += 1
+        if self.frequencias[palavra] == 1:
+            for delecao in self.gerar_delecoes(palavra, self.distancia_maxima):
+                self.delecoes.adicionar(delecao, palavra)
+
+    def remover_palavra(self, palavra):
+        self.frequencias[palavra] -= 1
+        if self.frequencias[palavra] <= 0:
+            del self.frequencias[palavra]
+            for delecao in self.gerar_delecoes(palavra, self.distancia_maxima):
+                self.delecoes.remover(delecao, palavra)
+
+    def atualizado(self, banco, temas):
+        novo = copy.copy(self)
+        novo.banco = banco
+        novo.frequencias = self.frequencias.copy()
+        novo.delecoes = self.delecoes.copiar()
+        novo.termos_por_tema = dict(self.termos_por_tema)
+        for tema in temas:
+            novo.atualizar_tema(tema)
+        return novo
+
+    def atualizar_tema(self, tema):
+        # Mesmo contrato de IndiceInvertido.atualizar_tema
+        for palavra in self.termos_por_tema.pop(tema, ()):
+            self.remover_palavra(palavra)
+        if tema in self.banco:
+            termos = termos_do_tema(tema, self.banco[tema])
+            for palavra in termos:
+                self.adicionar_palavra(palavra)
+            self.termos_por_tema[tema] = termos
+
+    def corrigir_palavra(self, palavra):
+        if palavra in self.frequencias:
+            return palavra
+        # Palavras curtas toleram menos erros, para não trocar "na" por "da"
+        distancia = min(self.distancia_maxima, (len(palavra) - 1) // 3)
+        if distancia <= 0:
+            return palavra
+        melhor, melhor_chave = palavra, (distancia + 1,)
+        for delecao in self.gerar_delecoes(palavra, distancia):
+            for candidata in self.delecoes.get(delecao, ()):
+                d = distancia_edicao(palavra, candidata, distancia)
+                chave = (d, -self.frequencias[candidata], candidata)
+                if d <= distancia and chave < melhor_chave:
+                    melhor, melhor_chave = candidata, chave
+        return melhor
+
+    def corrigir(self, texto):
+        return " ".join(self.corrigir_palavra(palavra) for palavra in tokenizar(texto))
@@ -0,0 +1,147 @@
+import zlib
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from icc.indice_invertido import tokenizar
+from icc.indice_trigramas import trigramas
+
+PRIMO_MERSENNE = (1 << 61) - 1
+# Jaccard mínimo entre as palavras de duas atividades para pedir confirmação antes de
+# somar uma à outra. Trocar uma palavra numa frase de cinco dá 0,67: "Roda de conversa
+# sobre machismo" e "... sobre racismo" não chegam a ser parecidas.
+LIMIAR_PARECIDAS = 0.8
+
+
+def normalizar_atividade(texto):
+    # Minúsculas, sem pontuação e com espaços simples: atividades iguais nessa forma são repetições
+    return " ".join(tokenizar(texto))
+
+
+def shingles(texto):
+    # Trigramas de caracteres do texto normalizado (minúsculas, sem pontuação)
+    return trigramas(normalizar_atividade(texto))
+
+
+def palavras(texto):
+    return set(tokenizar(texto))
+
+
+@lru_cache(maxsize=None)
+def coeficientes_hash(permutacoes, semente):
+    gerador = np.random.default_rng(semente)
+    return (
+        gerador.integers(1, PRIMO_MERSENNE, permutacoes, dtype=np.uint64),
+        gerador.integers(0, PRIMO_MERSENNE, permutacoes, dtype=np.uint64)
+    )
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class DetectorDuplicatas:
+    # Detecção de atividades quase duplicadas com MinHash + LSH. Cada texto vira uma
+    # assinatura de `permutacoes` mínimos, dividida em `bandas`; textos que coincidem em
+    # alguma banda são candidatos e só eles têm o Jaccard exato dos trigramas calculado.
+    # Com 16 bandas de 4 linhas, pares com Jaccard acima de ~0,5 quase sempre colidem.
+    # `extrair` define os conjuntos comparados: trigramas de caracteres ou palavras.
+
+    def __init__(self, limiar=0.65, permutacoes=64, bandas=16, semente=1, extrair=shingles):
+        if permutacoes % bandas:
+            raise ValueError("permutacoes deve ser múltiplo de bandas")
+        self.limiar = limiar
+        self.extrair = extrair
+        self.bandas = bandas
+        self.linhas = permutacoes // bandas
+        self.a, self.b = coeficientes_hash(permutacoes, semente)
+        self.buckets = [defaultdict(list) for _ in range(bandas)]
+        self.shingles = {}
+
+    def assinatura(self, conjunto):
+        if not conjunto:
+            return np.zeros(len(self.a), dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in conjunto), dtype=np.uint64, count=len(conjunto))
+        # hashes < 2^32 e a < 2^61: o produto pode estourar 64 bits, o que só muda a família de hash
+        permutados = (hashes[:, None] * self.a[None, :] + self.b[None, :]) % PRIMO_MERSENNE
+        return permutados.min(axis=0)
+
+    def chaves_bandas(self, assinatura):
+        return [assinatura[i * self.linhas:(i + 1) * self.linhas].tobytes() for i in range(self.bandas)]
+
+    def preparar(self, texto):
+        conjunto = self.extrair(texto)
+        return conjunto, self.chaves_bandas(self.assinatura(conjunto))
+
+    def adicionar(self, chave, texto, preparado=None):
+        conjunto, chaves_bandas = preparado or self.preparar(texto)
+        self.shingles[chave] = conjunto
+        for banda, chave_banda in zip(self.buckets, chaves_bandas):
+            banda[chave_banda].append(chave)
+
+    def semelhantes(self, texto, preparado=None):
+        # [(chave, jaccard)] dos textos já adicionados com Jaccard >= limiar, mais parecidos primeiro
+        conjunto, chaves_bandas = preparado or self.preparar(texto)
+        candidatos = set()
+        for banda, chave_banda in zip(self.buckets, chaves_bandas):
+            candidatos.update(banda.get(chave_banda, ()))
+        encontrados = []
+        for chave in candidatos:
+            similaridade = jaccard(conjunto, self.shingles[chave])
+            if similaridade >= self.limiar:
+                encontrados.append((chave, similaridade))
+        encontrados.sort(key=lambda item: -item[1])
+        return encontrados
+
+
+def deduplicar_atividades(atividades, limiar=0.65):
+    # Mantém a primeira ocorrência de cada grupo de atividades quase iguais.
+    # Devolve (atividades mantidas, [(descartada, mantida, jaccard)]).
+    detector = DetectorDuplicatas(limiar)
+    mantidas = []
+    duplicatas = []
+    for atividade in dict.fromkeys(atividades):
+        preparado = detector.preparar(atividade)
+        semelhantes = detector.semelhantes(atividade, preparado)
+        if semelhantes:
+            indice, similaridade = semelhantes[0]
+            duplicatas.append((atividade, mantidas[indice], similaridade))
+            continue
+        detector.adicionar(len(mantidas), atividade, preparado)
+        mantidas.append(atividade)
+    return mantidas, duplicatas
+
+
+def mesclar_atividades(existentes, novas, limiar=LIMIAR_PARECIDAS):
+    # Soma `novas` às `existentes` sem mexer nestas (nem compará-las entre si). Uma nova só
+    # é descartada se repetir, depois de normalizada, uma já presente (existente ou nova já
+    # aceita). A que só se parece (Jaccard das palavras >= limiar) também fica de fora, mas
+    # volta para quem chamou pedir confirmação.
+    # Devolve (atividades, [(repetida, presente)], [(parecida, presente, jaccard)]).
+    detector = DetectorDuplicatas(limiar, extrair=palavras)
+    atividades = list(dict.fromkeys(existentes))
+    presentes = {}
+    for indice, atividade in enumerate(atividades):
+        presentes.setdefault(normalizar_atividade(atividade), atividade)
+        detector.adicionar(indice, atividade)
+    repetidas = []
+    parecidas = []
+    for atividade in novas:
+        normalizada = normalizar_atividade(atividade)
+        if normalizada in presentes:
+            # Reenviar uma atividade idêntica (ex.: sugestão marcada) não é relatado
+            if atividade != presentes[normalizada]:
+                repetidas.append((atividade, presentes[normalizada]))
+            continue
+        # Parecidas repetidas só voltam uma vez
+        presentes[normalizada] = atividade
+        preparado = detector.preparar(atividade)
+        semelhantes = detector.semelhantes(atividade, preparado)
+        if semelhantes:
+            indice, similaridade = semelhantes[0]
+            parecidas.append((atividade, atividades[indice], similaridade))
+            continue
+        detector.adicionar(len(atividades), atividade, preparado)
+        atividades.append(atividade)
+    return atividades, repetidas, parecidas
@@ -0,0 +1,78 @@
+from icc.autocompletar import normalizar_termo
+from icc.importacao import normalizar_atividades, normalizar_keywords
+
+COLUNAS_EDICAO = ["Temática", "Palavras-chave", "Atividades"]
+# Coluna oculta na grade com o nome da temática ao abrir a página (vazia nas linhas novas):
+# liga cada linha à sua temática mesmo que o nome seja editado
+COLUNA_ORIGINAL = "Temática original"
+# Keywords nunca contêm vírgula e atividades nunca contêm quebra de linha (os formulários e
+# a importação separam por elas), então a grade pode juntá-las e separá-las sem ambiguidade
+SEPARADOR_KEYWORDS = ", "
+SEPARADOR_ATIVIDADES = "\n"
+
+
+def valores_originais(banco, temas):
+    # {tema: (keywords, atividades)} como o curador vê a página; guardar junto com a grade
+    return {tema: (tuple(banco[tema]["keywords"]), tuple(banco[tema]["atividades"])) for tema in temas if tema in banco}
+
+
+def linha_edicao(tema, keywords, atividades):
+    return {
+        "Temática": tema,
+        "Palavras-chave": SEPARADOR_KEYWORDS.join(keywords),
+        "Atividades": SEPARADOR_ATIVIDADES.join(atividades),
+        COLUNA_ORIGINAL: tema
+    }
+
+
+def linhas_edicao(originais):
+    return [linha_edicao(tema, *valores) for tema, valores in originais.items()]
+
+
+def texto_celula(valor):
+    # Células novas ou apagadas no st.data_editor chegam como None/NaN
+    return valor if isinstance(valor, str) else ""
+
+
+def valores_linha(linha, original):
+    # (keywords, atividades) da linha; a célula que não foi mexida mantém os valores originais
+    keywords = texto_celula(linha.get("Palavras-chave"))
+    atividades = texto_celula(linha.get("Atividades"))
+    if original is not None:
+        linha_original = linha_edicao("", *original)
+        if keywords == linha_original["Palavras-chave"]:
+            keywords = original[0]
+        if atividades == linha_original["Atividades"]:
+            atividades = original[1]
+    if isinstance(keywords, str):
+        keywords = normalizar_keywords(keywords)
+    if isinstance(atividades, str):
+        atividades = normalizar_atividades(atividades.split(SEPARADOR_ATIVIDADES))
+    return tuple(keywords), tuple(atividades)
+
+
+def diferencas(originais, linhas):
+    # Compara a grade editada com a original e devolve (alteracoes, esperados) para
+    # ServicoBanco.salvar_se_inalterado: só temáticas inseridas, alteradas ou removidas.
+    # Cada linha é ligada à sua temática pela coluna oculta; só nomes novos ou editados
+    # são normalizados, e renomear grava a temática nova e remove a antiga.
+    alteracoes = {}
+    mantidos = set()
+    for linha in linhas:
+        original = texto_celula(linha.get(COLUNA_ORIGINAL))
+        if original not in originais:
+            original = ""
+        nome = texto_celula(linha.get("Temática"))
+        tema = original if original and nome == original else normalizar_termo(nome)
+        if not tema:
+            continue
+        valores = valores_linha(linha, originais.get(original))
+        if tema == original:
+            mantidos.add(tema)
+            if valores == originais[tema]:
+                continue
+        alteracoes[tema] = {"keywords": list(valores[0]), "atividades": list(valores[1])}
+    for tema in originais.keys() - mantidos - alteracoes.keys():
+        alteracoes[tema] = None
+    esperados = {tema: originais.get(tema) for tema in alteracoes}
+    return alteracoes, esperados
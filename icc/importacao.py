@@ -0,0 +1,127 @@
+import csv
+import io
+import re
+from collections import Counter
+
+from icc.autocompletar import normalizar_termo
+from icc.banco_compacto import ler_temas
+from icc.deduplicacao import mesclar_atividades
+
+TAMANHO_LOTE_IMPORTACAO = 500
+TAMANHO_MAXIMO_TEMA = 200
+SEPARADORES_KEYWORDS = re.compile(r"[,;|]")
+SEPARADORES_ATIVIDADES = re.compile(r"[;|\n]")
+
+
+def normalizar_keywords(texto_ou_lista):
+    if isinstance(texto_ou_lista, str):
+        texto_ou_lista = SEPARADORES_KEYWORDS.split(texto_ou_lista)
+    return list(dict.fromkeys(k for k in map(normalizar_termo, texto_ou_lista) if k))
+
+
+def normalizar_atividades(texto_ou_lista):
+    if isinstance(texto_ou_lista, str):
+        texto_ou_lista = SEPARADORES_ATIVIDADES.split(texto_ou_lista)
+    return list(dict.fromkeys(a for a in (" ".join(a.split()) for a in texto_ou_lista) if a))
+
+
+def ler_registros_csv(arquivo):
+    # Colunas: tema, keywords (separadas por vírgula) e atividade ou atividades (separadas
+    # por ";"). A mesma temática pode aparecer em várias linhas, uma por atividade.
+    leitor = csv.DictReader(arquivo)
+    for numero_linha, linha in enumerate(leitor, start=2):
+        tema = normalizar_termo(linha.get("tema") or "")
+        if not tema:
+            yield numero_linha, None, "temática vazia"
+            continue
+        if len(tema) > TAMANHO_MAXIMO_TEMA:
+            yield numero_linha, None, f"temática com mais de {TAMANHO_MAXIMO_TEMA} caracteres"
+            continue
+        keywords = normalizar_keywords(linha.get("keywords") or linha.get("palavras_chave") or "")
+        atividades = normalizar_atividades(linha.get("atividades") or linha.get("atividade") or "")
+        if not keywords and not atividades:
+            yield numero_linha, None, "sem palavras-chave nem atividades"
+            continue
+        yield numero_linha, (tema, keywords, atividades), None
+
+
+def ler_registros_json(caminho):
+    # Qualquer formato de banco aceito por ler_temas, lido temática a temática
+    for numero, (tema, dados) in enumerate(ler_temas(caminho), start=1):
+        tema = normalizar_termo(tema)
+        if not tema or len(tema) > TAMANHO_MAXIMO_TEMA:
+            yield numero, None, "temática vazia ou longa demais"
+            continue
+        yield numero, (tema, normalizar_keywords(dados.get("keywords", ())), normalizar_atividades(dados.get("atividades", ()))), None
+
+
+def importar_registros(servico, registros, tamanho_lote=TAMANHO_LOTE_IMPORTACAO, progresso=None, erros=None,
+                       parecidas=None):
+    # Agrupa os registros por temática e grava em lotes de `tamanho_lote` temáticas, cada
+    # lote numa única chamada a servico.salvar(). Keywords e atividades são somadas às já
+    # existentes no banco, que nunca são removidas; só repetições (mesmo texto normalizado)
+    # são descartadas. Atividades apenas parecidas com outras são importadas e relatadas
+    # em `parecidas(tema, atividade, presente, similaridade)`, para revisão. Os lotes não
+    # atualizam os índices derivados, que só são construídos quando alguém os pede.
+    # `progresso(contagem)` é chamado após cada lote e `erros(linha, mensagem)` para cada
+    # registro ignorado.
+    contagem = Counter(linhas=0, ignoradas=0, temas=0, atividades=0, duplicatas=0, parecidas=0)
+    pendentes = {}
+
+    def gravar_lote():
+        banco = servico.obter()
+        alteracoes = {}
+        for tema, (keywords, atividades) in pendentes.items():
+            atual = banco.get(tema, {"keywords": (), "atividades": ()})
+            todas_keywords = list(dict.fromkeys([*atual["keywords"], *keywords]))
+            todas_atividades, repetidas, semelhantes = mesclar_atividades(atual["atividades"], atividades)
+            contagem["duplicatas"] += len(repetidas)
+            # Sem como confirmar durante a importação: entram e são relatadas
+            contagem["parecidas"] += len(semelhantes)
+            for atividade, presente, similaridade in semelhantes:
+                todas_atividades.append(atividade)
+                if parecidas:
+                    parecidas(tema, atividade, presente, similaridade)
+            if todas_keywords == list(atual["keywords"]) and todas_atividades == list(atual["atividades"]):
+                continue
+            contagem["atividades"] += len(todas_atividades) - len(atual["atividades"])
+            alteracoes[tema] = {"keywords": todas_keywords, "atividades": todas_atividades}
+        if alteracoes:
+            servico.salvar(alteracoes, atualizar_derivados=False)
+            contagem["temas"] += len(alteracoes)
+        pendentes.clear()
+        if progresso:
+            progresso(contagem)
+
+    for numero_linha, registro, erro in registros:
+        contagem["linhas"] += 1
+        if erro:
+            contagem["ignoradas"] += 1
+            if erros:
+                erros(numero_linha, erro)
+            continue
+        tema, keywords, atividades = registro
+        keywords_pendentes, atividades_pendentes = pendentes.setdefault(tema, ([], []))
+        keywords_pendentes.extend(keywords)
+        atividades_pendentes.extend(atividades)
+        if len(pendentes) >= tamanho_lote:
+            gravar_lote()
+    if pendentes:
+        gravar_lote()
+    return contagem
+
+
+def importar_arquivo(servico, arquivo, nome, tamanho_lote=TAMANHO_LOTE_IMPORTACAO, progresso=None, erros=None,
+                     parecidas=None):
+    # `arquivo` é binário (arquivo aberto com "rb" ou enviado pelo st.file_uploader); o
+    # formato vem da extensão de `nome`: .csv ou JSON em qualquer formato de banco
+    texto = io.TextIOWrapper(arquivo, encoding="utf-8-sig", newline="")
+    try:
+        if str(nome).lower().endswith(".csv"):
+            registros = ler_registros_csv(texto)
+        else:
+            registros = ler_registros_json(texto)
+        return importar_registros(servico, registros, tamanho_lote, progresso, erros, parecidas)
+    finally:
+        # Devolve o arquivo ao chamador sem fechá-lo
+        texto.detach()
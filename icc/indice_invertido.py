@@ -0,0 +1,82 @@
+import copy
+import re
+
+from icc.mapa_conjuntos import MapaConjuntos
+
+
+def tokenizar(texto):
+    return re.findall(r"\w+", texto.lower())
+
+
+class IndiceInvertido:
+    # Mapeia cada palavra-chave (e o próprio nome da temática), já tokenizada,
+    # para as temáticas do banco semântico que a declaram. Como na busca original, um
+    # termo casa em qualquer ponto do texto digitado, inclusive dentro de uma palavra
+    # ("afro" em "afrodescendente"): cada palavra digitada só é comparada com os seus
+    # próprios pedaços, nunca com o vocabulário inteiro. Frases com várias palavras
+    # ("justiça social") são procuradas a partir da primeira palavra. Uma instância
+    # publicada não muda mais: atualizado() devolve a versão seguinte.
+
+    def __init__(self, banco):
+        self.banco = banco
+        self.frases = MapaConjuntos()
+        self.frases_por_tema = {}
+        self.por_inicio = MapaConjuntos()
+        self.ordem = {}
+        for tema in banco:
+            self.atualizar_tema(tema)
+
+    def remover_tema(self, tema):
+        for frase in self.frases_por_tema.pop(tema, ()):
+            if self.frases.remover(frase, tema) and len(frase) > 1:
+                self.por_inicio.remover(frase[0], frase)
+        self.ordem.pop(tema, None)
+
+    def atualizado(self, banco, temas):
+        # Cópia para a nova versão `banco`, com só as `temas` alteradas reindexadas
+        novo = copy.copy(self)
+        novo.banco = banco
+        novo.frases = self.frases.copiar()
+        novo.frases_por_tema = dict(self.frases_por_tema)
+        novo.por_inicio = self.por_inicio.copiar()
+        novo.ordem = dict(self.ordem)
+        for tema in temas:
+            novo.atualizar_tema(tema)
+        return novo
+
+    def atualizar_tema(self, tema):
+        # Reindexa só a temática alterada; fora da construção, só numa cópia feita por atualizado()
+        ordem = self.ordem.get(tema, len(self.ordem))
+        self.remover_tema(tema)
+        dados = self.banco.get(tema)
+        if dados is None:
+            return
+        frases = {tuple(tokenizar(p)) for p in [tema, *dados.get("keywords", [])]}
+        frases.discard(())
+        for frase in frases:
+            self.frases.adicionar(frase, tema)
+            if len(frase) > 1:
+                self.por_inicio.adicionar(frase[0], frase)
+        self.frases_por_tema[tema] = frases
+        self.ordem[tema] = ordem
+
+    def encontrar_temas(self, tema_digitado):
+        palavras = tokenizar(tema_digitado)
+        encontrados = set()
+        for posicao, palavra in enumerate(palavras):
+            for inicio in range(len(palavra)):
+                for fim in range(inicio + 1, len(palavra) + 1):
+                    encontrados.update(self.frases.get((palavra[inicio:fim],), ()))
+                # Frase que começa no fim desta palavra e termina no começo de uma seguinte
+                for frase in self.por_inicio.get(palavra[inicio:], ()):
+                    seguintes = palavras[posicao + 1:posicao + len(frase)]
+                    if (len(seguintes) == len(frase) - 1 and tuple(seguintes[:-1]) == frase[1:-1]
+                            and seguintes[-1].startswith(frase[-1])):
+                        encontrados.update(self.frases[frase])
+        return sorted(encontrados, key=self.ordem.__getitem__)
+
+    def encontrar_atividades(self, tema_digitado):
+        atividades = []
+        for tema in self.encontrar_temas(tema_digitado):
+            atividades.extend(self.banco[tema].get("atividades", []))
+        return atividades
@@ -0,0 +1,71 @@
+import heapq
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+
+def trigramas(texto):
+    texto = f"  {texto.lower()} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceTrigramas:
+    # Índice de trigramas de caracteres sobre as chaves do banco (nomes de temáticas).
+    # Cada consulta pré-seleciona as chaves que mais compartilham trigramas com a
+    # palavra e só nelas calcula a similaridade exata do difflib, com a mesma
+    # pontuação e o mesmo cutoff de get_close_matches.
+
+    def __init__(self, chaves=(), tamanho_pre_selecao=64):
+        self.tamanho_pre_selecao = tamanho_pre_selecao
+        self.chaves = []
+        self.ids = {}
+        self.postings = defaultdict(set)
+        for chave in chaves:
+            self.adicionar(chave)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, chave):
+        return chave in self.ids
+
+    def adicionar(self, chave):
+        if chave in self.ids:
+            return
+        self.ids[chave] = len(self.chaves)
+        self.chaves.append(chave)
+        for grama in trigramas(chave):
+            self.postings[grama].add(self.ids[chave])
+
+    def remover(self, chave):
+        id_chave = self.ids.pop(chave, None)
+        if id_chave is None:
+            return
+        self.chaves[id_chave] = None
+        for grama in trigramas(chave):
+            ids = self.postings[grama]
+            ids.discard(id_chave)
+            if not ids:
+                del self.postings[grama]
+
+    def candidatos(self, palavra, limite=None):
+        contagem = Counter()
+        for grama in trigramas(palavra):
+            contagem.update(self.postings.get(grama, ()))
+        return [self.chaves[i] for i, _ in contagem.most_common(limite or self.tamanho_pre_selecao)]
+
+    def mais_proximos(self, palavra, n=3, cutoff=0.6):
+        # Devolve até n pares (chave, similaridade), do mais para o menos parecido
+        matcher = SequenceMatcher()
+        matcher.set_seq2(palavra)
+        resultados = []
+        for chave in self.candidatos(palavra, max(self.tamanho_pre_selecao, n)):
+            matcher.set_seq1(chave)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                similaridade = matcher.ratio()
+                if similaridade >= cutoff:
+                    resultados.append((similaridade, chave))
+        return [(chave, similaridade) for similaridade, chave in heapq.nlargest(n, resultados)]
+
+    def aproximados(self, palavra, n=3, cutoff=0.6):
+        # Substituto direto de difflib.get_close_matches(palavra, chaves, n, cutoff)
+        return [chave for chave, _ in self.mais_proximos(palavra, n, cutoff)]
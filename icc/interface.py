@@ -0,0 +1,130 @@
+import pandas as pd
+import streamlit as st
+
+from icc.deduplicacao import mesclar_atividades
+from icc.edicao import COLUNA_ORIGINAL, COLUNAS_EDICAO, diferencas, linhas_edicao, valores_originais
+from icc.importacao import importar_arquivo
+from icc.listagem import TAMANHO_PAGINA
+
+# Seções de tela repetidas entre as variantes do formulário; cada uma desenha os próprios
+# widgets e grava pelo ServicoBanco recebido.
+
+
+def secao_importacao(servico):
+    st.markdown("### 📥 Importar em massa")
+    arquivo_importacao = st.file_uploader(
+        "CSV (colunas tema, keywords, atividade) ou JSON no formato do banco", type=["csv", "json"], key="arquivo_importacao"
+    )
+    if arquivo_importacao and st.button("Importar arquivo", key="importar_arquivo"):
+        barra = st.progress(0.0)
+        parecidas = []
+        contagem = importar_arquivo(
+            servico, arquivo_importacao, arquivo_importacao.name,
+            progresso=lambda c: barra.progress(min(arquivo_importacao.tell() / max(arquivo_importacao.size, 1), 1.0)),
+            parecidas=lambda *parecida: parecidas.append(parecida)
+        )
+        barra.progress(1.0)
+        st.success(
+            f"{contagem['linhas']} registros lidos: {contagem['atividades']} atividades novas; "
+            f"{contagem['duplicatas']} repetições e {contagem['ignoradas']} registros inválidos ignorados."
+        )
+        if parecidas:
+            st.warning(f"{len(parecidas)} atividade(s) importada(s) parecem outras já cadastradas; revise na edição do banco.")
+            st.dataframe(pd.DataFrame(parecidas, columns=["Temática", "Importada", "Parecida com", "Semelhança"]))
+
+
+def salvar_atividades(servico, tema, novas, keywords=()):
+    # Soma `novas` (e `keywords`) à temática, sem tocar nas atividades já cadastradas.
+    # Repetições são descartadas; as apenas parecidas com outras ficam pendentes até
+    # serem confirmadas em confirmar_parecidas().
+    dados = servico.obter().get(tema, {"keywords": (), "atividades": ()})
+    atividades, repetidas, parecidas = mesclar_atividades(dados["atividades"], novas)
+    servico.salvar({tema: {"keywords": list(dict.fromkeys([*dados["keywords"], *keywords])), "atividades": atividades}})
+    if repetidas:
+        st.info(f"{len(repetidas)} atividade(s) repetida(s) não foram gravadas de novo.")
+    if parecidas:
+        st.session_state.atividades_parecidas = {"tema": tema, "parecidas": parecidas}
+    else:
+        st.session_state.pop("atividades_parecidas", None)
+
+
+def confirmar_parecidas(servico):
+    # Mostra, até serem confirmadas ou descartadas, as atividades que salvar_atividades()
+    # deixou de fora por parecerem outras já cadastradas
+    pendentes = st.session_state.get("atividades_parecidas")
+    if not pendentes:
+        return
+    tema = pendentes["tema"]
+    st.warning(f"Estas sugestões para '{tema}' parecem atividades já cadastradas. Marque as que devem ser adicionadas mesmo assim.")
+    confirmadas = [
+        atividade
+        for i, (atividade, presente, _) in enumerate(pendentes["parecidas"])
+        if st.checkbox(f"{atividade} (parecida com: {presente})", key=f"parecida_{i}")
+    ]
+    col1, col2 = st.columns(2)
+    if col1.button("Adicionar marcadas", key="adicionar_parecidas", disabled=not confirmadas):
+        dados = servico.obter().get(tema, {"keywords": (), "atividades": ()})
+        servico.salvar({tema: {
+            "keywords": list(dados["keywords"]),
+            "atividades": list(dict.fromkeys([*dados["atividades"], *confirmadas]))
+        }})
+        del st.session_state.atividades_parecidas
+        st.success(f"{len(confirmadas)} atividade(s) adicionada(s) à temática '{tema}'.")
+    elif col2.button("Descartar", key="descartar_parecidas"):
+        del st.session_state.atividades_parecidas
+
+
+def listagem_paginada(listagem):
+    # Filtros, página e tabela de uma ListagemBanco. Devolve as temáticas da página e uma
+    # chave (página e filtros) que muda quando outra página passa a ser mostrada.
+    col1, col2, col3 = st.columns(3)
+    filtros = {
+        "tema": col1.text_input("Buscar na temática", key="filtro_tema"),
+        "keyword": col2.text_input("Buscar nas palavras-chave", key="filtro_keyword"),
+        "atividade": col3.text_input("Buscar nas atividades", key="filtro_atividade"),
+        "minimo_atividades": st.number_input("Mínimo de atividades", min_value=0, value=0, step=1, key="filtro_minimo")
+    }
+    numero = st.number_input("Página", min_value=1, value=1, step=1, key="pagina_banco")
+    temas, linhas, total = listagem.pagina(numero, **filtros)
+    paginas = max(1, -(-total // TAMANHO_PAGINA))
+    numero = min(numero, paginas)
+    st.caption(f"Página {numero} de {paginas} · {total} temáticas encontradas")
+    st.dataframe(pd.DataFrame(linhas))
+    return temas, (numero, *filtros.values())
+
+
+def grade_edicao(servico, banco, temas, chave):
+    # Grade editável das `temas` de `banco` (a fotografia de onde veio a listagem). Parte dos
+    # valores vistos ao abrir a página (`chave` muda com a página e os filtros); só as linhas
+    # alteradas são gravadas e temáticas mudadas por outra pessoa nesse meio-tempo não são
+    # sobrescritas.
+    st.markdown("#### ✏️ Editar esta página")
+    edicao = st.session_state.get("edicao")
+    if edicao is None or edicao["chave"] != chave:
+        edicao = st.session_state.edicao = {
+            "chave": chave,
+            "originais": valores_originais(banco, temas),
+            "revisao": (edicao or {}).get("revisao", 0) + 1
+        }
+    editadas = st.data_editor(
+        pd.DataFrame(linhas_edicao(edicao["originais"]), columns=[*COLUNAS_EDICAO, COLUNA_ORIGINAL]),
+        column_order=COLUNAS_EDICAO,
+        column_config={
+            "Palavras-chave": st.column_config.TextColumn(help="Separadas por vírgula"),
+            "Atividades": st.column_config.TextColumn(help="Uma por linha")
+        },
+        num_rows="dynamic", use_container_width=True, key=f"editor_banco_{edicao['revisao']}"
+    )
+    if st.button("💾 Salvar alterações", key="salvar_edicao"):
+        alteracoes, esperados = diferencas(edicao["originais"], editadas.to_dict("records"))
+        conflitos = servico.salvar_se_inalterado(alteracoes, esperados)
+        edicao["chave"] = None
+        if alteracoes:
+            st.success(f"{len(alteracoes) - len(conflitos)} temática(s) atualizada(s).")
+        else:
+            st.info("Nenhuma alteração para salvar.")
+        if conflitos:
+            st.warning(
+                "Não salvas, pois foram alteradas por outra pessoa desde que a página foi aberta: "
+                + ", ".join(conflitos) + ". Reabra a página para ver a versão atual."
+            )
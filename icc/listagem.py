@@ -0,0 +1,147 @@
+import copy
+from bisect import bisect_left, insort
+
+from icc.indice_invertido import tokenizar
+from icc.mapa_conjuntos import MapaConjuntos
+
+TAMANHO_PAGINA = 25
+FIM_PREFIXO = chr(0x10FFFF)
+
+
+class _IndicePalavras:
+    # Palavra -> temáticas, com vocabulário ordenado para buscar palavras por prefixo
+    def __init__(self):
+        self.postings = MapaConjuntos()
+        self.vocabulario = []
+
+    def copiar(self):
+        novo = _IndicePalavras()
+        novo.postings = self.postings.copiar()
+        novo.vocabulario = list(self.vocabulario)
+        return novo
+
+    def adicionar(self, tema, textos):
+        for palavra in {p for texto in textos for p in tokenizar(texto)}:
+            if palavra not in self.postings:
+                insort(self.vocabulario, palavra)
+            self.postings.adicionar(palavra, tema)
+
+    def remover(self, tema, textos):
+        for palavra in {p for texto in textos for p in tokenizar(texto)}:
+            if self.postings.remover(palavra, tema):
+                del self.vocabulario[bisect_left(self.vocabulario, palavra)]
+
+    def buscar(self, consulta):
+        # Temáticas com todas as palavras da consulta (cada uma como prefixo); None se vazia
+        encontrados = None
+        for palavra in sorted(set(tokenizar(consulta)), key=len, reverse=True):
+            inicio = bisect_left(self.vocabulario, palavra)
+            fim = bisect_left(self.vocabulario, palavra + FIM_PREFIXO, inicio)
+            temas = set()
+            for completa in self.vocabulario[inicio:fim]:
+                temas |= self.postings[completa]
+            encontrados = temas if encontrados is None else encontrados & temas
+            if not encontrados:
+                return set()
+        return encontrados
+
+
+class ListagemBanco:
+    # Listagem paginada do banco para a tela "Ver Banco". As temáticas ficam em ordem
+    # alfabética e os filtros usam índices de palavras (temática, keyword, atividade), então
+    # só as temáticas que casam com a busca são tocadas. O resultado de cada filtro é
+    # guardado até o banco mudar: trocar de página é só fatiar uma lista. Uma instância
+    # publicada não muda; atualizado() monta a da próxima versão do banco.
+
+    def __init__(self, banco, tamanho_cache=64):
+        self.banco = banco
+        self.tamanho_cache = tamanho_cache
+        self.ordem = sorted(banco)
+        self.por_tema = _IndicePalavras()
+        self.por_keyword = _IndicePalavras()
+        self.por_atividade = _IndicePalavras()
+        self.por_contagem = []
+        self.indexados = {}
+        self.cache = {}
+        for tema in self.ordem:
+            self.indexar(tema)
+
+    def indexar(self, tema):
+        dados = self.banco[tema]
+        keywords, atividades = dados.get("keywords", ()), dados.get("atividades", ())
+        self.por_tema.adicionar(tema, [tema])
+        self.por_keyword.adicionar(tema, keywords)
+        self.por_atividade.adicionar(tema, atividades)
+        self.indexados[tema] = (keywords, atividades)
+        insort(self.por_contagem, (len(atividades), tema))
+
+    def atualizado(self, banco, temas):
+        novo = copy.copy(self)
+        novo.banco = banco
+        novo.ordem = list(self.ordem)
+        novo.por_tema = self.por_tema.copiar()
+        novo.por_keyword = self.por_keyword.copiar()
+        novo.por_atividade = self.por_atividade.copiar()
+        novo.por_contagem = list(self.por_contagem)
+        novo.indexados = dict(self.indexados)
+        novo.cache = {}
+        for tema in temas:
+            novo.atualizar_tema(tema)
+        return novo
+
+    def atualizar_tema(self, tema):
+        # Reindexa só a temática alterada; fora da construção, só numa cópia feita por atualizado()
+        antigo = self.indexados.pop(tema, None)
+        if antigo is not None:
+            keywords, atividades = antigo
+            self.por_tema.remover(tema, [tema])
+            self.por_keyword.remover(tema, keywords)
+            self.por_atividade.remover(tema, atividades)
+            del self.por_contagem[bisect_left(self.por_contagem, (len(atividades), tema))]
+            del self.ordem[bisect_left(self.ordem, tema)]
+        if tema in self.banco:
+            insort(self.ordem, tema)
+            self.indexar(tema)
+        self.cache.clear()
+
+    def filtrar(self, tema="", keyword="", atividade="", minimo_atividades=0, maximo_atividades=None):
+        chave = (tema, keyword, atividade, minimo_atividades, maximo_atividades)
+        resultado = self.cache.get(chave)
+        if resultado is not None:
+            return resultado
+        candidatos = None
+        for indice, consulta in ((self.por_tema, tema), (self.por_keyword, keyword), (self.por_atividade, atividade)):
+            encontrados = indice.buscar(consulta)
+            if encontrados is not None:
+                candidatos = encontrados if candidatos is None else candidatos & encontrados
+        if minimo_atividades or maximo_atividades is not None:
+            inicio = bisect_left(self.por_contagem, (minimo_atividades,))
+            fim = len(self.por_contagem) if maximo_atividades is None else bisect_left(self.por_contagem, (maximo_atividades + 1,))
+            encontrados = {t for _, t in self.por_contagem[inicio:fim]}
+            candidatos = encontrados if candidatos is None else candidatos & encontrados
+        if candidatos is None:
+            # Sem filtros: a própria ordem serve, sem copiar
+            return self.ordem
+        temas = sorted(candidatos)
+        if len(self.cache) >= self.tamanho_cache:
+            self.cache.clear()
+        self.cache[chave] = temas
+        return temas
+
+    def pagina(self, numero=1, tamanho=TAMANHO_PAGINA, **filtros):
+        # (temáticas da página `numero`, linhas para exibir e total de temáticas que passam
+        # nos filtros), com um único filtro. Páginas além da última mostram a última.
+        temas = self.filtrar(**filtros)
+        numero = min(numero, max(1, -(-len(temas) // tamanho)))
+        inicio = (numero - 1) * tamanho
+        temas_pagina = temas[inicio:inicio + tamanho]
+        linhas = []
+        for tema in temas_pagina:
+            keywords, atividades = self.indexados[tema]
+            linhas.append({
+                "Temática": tema.title(),
+                "Palavras-chave": ", ".join(keywords),
+                "Nº de atividades": len(atividades),
+                "Atividades": "; ".join(atividades)
+            })
+        return temas_pagina, linhas, len(temas)
@@ -0,0 +1,56 @@
+class MapaConjuntos:
+    # Dicionário chave -> conjunto com cópia na escrita, para índices publicados junto
+    # com cada versão do banco. copiar() é uma cópia rasa; na cópia, cada conjunto só é
+    # duplicado na primeira vez que for alterado. A versão original nunca muda e a nova
+    # só paga pelas chaves em que mexeu. Enquanto o índice é construído (antes da primeira
+    # cópia), todos os conjuntos são do próprio mapa e são alterados no lugar.
+    __slots__ = ("conjuntos", "proprios")
+
+    def __init__(self):
+        self.conjuntos = {}
+        # Chaves cujos conjuntos já foram duplicados por esta cópia; None: todos são deste mapa
+        self.proprios = None
+
+    def copiar(self):
+        novo = MapaConjuntos()
+        novo.conjuntos = dict(self.conjuntos)
+        novo.proprios = set()
+        return novo
+
+    def proprio(self, chave):
+        conjunto = self.conjuntos.get(chave)
+        if conjunto is None:
+            conjunto = self.conjuntos[chave] = set()
+        elif self.proprios is None or chave in self.proprios:
+            return conjunto
+        else:
+            conjunto = self.conjuntos[chave] = set(conjunto)
+        if self.proprios is not None:
+            self.proprios.add(chave)
+        return conjunto
+
+    def adicionar(self, chave, valor):
+        self.proprio(chave).add(valor)
+
+    def remover(self, chave, valor):
+        # True se o conjunto ficou vazio e a chave saiu do mapa
+        if chave not in self.conjuntos:
+            return False
+        conjunto = self.proprio(chave)
+        conjunto.discard(valor)
+        if conjunto:
+            return False
+        del self.conjuntos[chave]
+        return True
+
+    def get(self, chave, padrao=None):
+        return self.conjuntos.get(chave, padrao)
+
+    def __getitem__(self, chave):
+        return self.conjuntos[chave]
+
+    def __contains__(self, chave):
+        return chave in self.conjuntos
+
+    def __len__(self):
+        return len(self.conjuntos)
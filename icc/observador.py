@@ -0,0 +1,105 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_CLOEXEC = 0o2000000
+EVENTOS = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+CABECALHO_EVENTO = struct.Struct("iIII")
+TAMANHO_LEITURA = 1 << 16
+# Uma gravação gera uma rajada de eventos (temporário, troca, diário); espera-se
+# esse tanto depois do primeiro para recarregar uma vez só
+ESPERA_RAJADA = 0.05
+
+
+def abrir_inotify(diretorios):
+    # Descritor inotify observando `diretorios`, ou None se o sistema não tem inotify
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    for diretorio in diretorios:
+        if libc.inotify_add_watch(fd, os.fsencode(diretorio), EVENTOS) < 0:
+            os.close(fd)
+            return None
+    return fd
+
+
+class ObservadorArquivos:
+    # Chama `ao_mudar()` numa thread própria quando algum dos `caminhos` muda. Com inotify
+    # observa os diretórios (gravações atômicas trocam o arquivo, o que derruba um
+    # observador no próprio arquivo); sem ele, compara `assinatura()` a cada `intervalo` segundos.
+
+    def __init__(self, caminhos, ao_mudar, assinatura, intervalo=0.5):
+        caminhos = [Path(caminho).resolve() for caminho in caminhos]
+        self.nomes = {os.fsencode(caminho.name) for caminho in caminhos}
+        self.ao_mudar = ao_mudar
+        self.assinatura = assinatura
+        self.intervalo = intervalo
+        self.fd = abrir_inotify({caminho.parent for caminho in caminhos})
+        self.modo = "polling" if self.fd is None else "inotify"
+        self.encerrar = threading.Event()
+        self.thread = threading.Thread(target=self.executar, name="observador-banco", daemon=True)
+
+    def iniciar(self):
+        self.thread.start()
+        return self
+
+    def ativo(self):
+        return self.thread.is_alive() and not self.encerrar.is_set()
+
+    def parar(self):
+        self.encerrar.set()
+        self.thread.join()
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def executar(self):
+        if self.fd is None:
+            self.consultar_periodicamente()
+            return
+        while not self.encerrar.is_set():
+            prontos, _, _ = select.select([self.fd], [], [], self.intervalo)
+            if not prontos or not self.ler_eventos():
+                continue
+            self.encerrar.wait(ESPERA_RAJADA)
+            while select.select([self.fd], [], [], 0)[0]:
+                self.ler_eventos()
+            self.ao_mudar()
+
+    def consultar_periodicamente(self):
+        ultima = self.assinatura()
+        while not self.encerrar.wait(self.intervalo):
+            atual = self.assinatura()
+            if atual != ultima:
+                ultima = atual
+                self.ao_mudar()
+
+    def ler_eventos(self):
+        # True se algum evento lido é de um dos arquivos observados
+        dados = os.read(self.fd, TAMANHO_LEITURA)
+        relevante = False
+        posicao = 0
+        while posicao < len(dados):
+            _, _, _, tamanho = CABECALHO_EVENTO.unpack_from(dados, posicao)
+            posicao += CABECALHO_EVENTO.size
+            nome = dados[posicao:posicao + tamanho].rstrip(b"\0")
+            posicao += tamanho
+            relevante = relevante or nome in self.nomes
+        return relevante
@@ -0,0 +1,71 @@
+from bisect import bisect_right
+
+import numpy as np
+
+CRITERIOS = [
+    "Promoção da equidade e inclusão",
+    "Estímulo à participação democrática",
+    "Desenvolvimento do pensamento crítico",
+    "Integração com problemas reais da sociedade",
+    "Uso ético e consciente das tecnologias",
+    "Valorização de identidades e culturas diversas",
+    "Empatia e diálogo",
+    "Consciência socioambiental",
+    "Direitos humanos e justiça social",
+    "Engajamento comunitário e responsabilidade coletiva",
+    "Cidadania digital"
+]
+
+ESCALA_NOTAS = {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}
+
+# Limites inferiores das faixas de interpretação, em ordem crescente
+LIMIARES_ICC = [0.5, 0.7, 0.85]
+INTERPRETACOES = [
+    "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão.",
+    "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões.",
+    "Boa contribuição, com potencial de fortalecimento em alguns critérios.",
+    "Excelente contribuição para a formação cidadã e a diversidade social."
+]
+
+# Tabela indexada pela própria nota (posição 0 não é usada)
+_TABELA_NOTAS = np.array([np.nan] + [ESCALA_NOTAS[n] for n in range(1, 5)])
+_INTERPRETACOES = np.array(INTERPRETACOES, dtype=object)
+
+
+def converter_nota(nota):
+    return ESCALA_NOTAS[nota]
+
+
+def interpretar_icc(valor):
+    return INTERPRETACOES[bisect_right(LIMIARES_ICC, valor)]
+
+
+def converter_notas(notas):
+    notas = np.asarray(notas)
+    if notas.size and (notas.min() < 1 or notas.max() > 4 or (notas != np.floor(notas)).any()):
+        raise ValueError("As notas devem ser inteiros entre 1 e 4.")
+    return _TABELA_NOTAS[notas.astype(np.intp)]
+
+
+def calcular_icc_lote(notas, pesos):
+    # notas: matriz (avaliações x critérios); pesos: mesma forma ou um vetor por critério
+    if len(notas) == 0:
+        return np.empty(0), np.empty(0, dtype=object)
+    convertidas = converter_notas(np.atleast_2d(notas))
+    pesos = np.broadcast_to(np.asarray(pesos, dtype=float), convertidas.shape)
+    denominador = pesos.sum(axis=1)
+    if (denominador <= 0).any():
+        raise ValueError("A soma dos pesos de cada avaliação deve ser positiva.")
+    icc = np.einsum("ij,ij->i", convertidas, pesos) / denominador
+    faixas = np.searchsorted(LIMIARES_ICC, icc, side="right")
+    return icc, _INTERPRETACOES[faixas]
+
+
+def calcular_icc(notas_usuario, pesos_usuario, criterios=None):
+    if criterios is None:
+        criterios = list(pesos_usuario)
+    icc, _ = calcular_icc_lote(
+        [[notas_usuario[c] for c in criterios]],
+        [[pesos_usuario[c] for c in criterios]]
+    )
+    return float(icc[0])
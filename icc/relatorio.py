@@ -0,0 +1,160 @@
+import math
+import os
+import textwrap
+
+from fpdf import FPDF
+
+from icc.pontuacao import CRITERIOS, calcular_icc, converter_nota, interpretar_icc
+
+logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
+# Quatro arcos de Bézier com pontos de controle a 0,5523 do raio aproximam um círculo
+KAPPA_CIRCULO = 0.5523
+
+
+class GraficosPDF:
+    # Primitivas vetoriais para FPDF, que só oferece linhas e retângulos. Coordenadas em
+    # unidades da página, com y crescendo para baixo como no resto do FPDF. Usar antes
+    # de FPDF nas bases da classe: class RelatorioICC(GraficosPDF, FPDF).
+
+    def ponto_pdf(self, x, y):
+        return f"{x * self.k:.2f} {(self.h - y) * self.k:.2f}"
+
+    def operador_pintura(self, estilo):
+        return {"F": "f", "FD": "B", "DF": "B"}.get(estilo, "S")
+
+    def poligono(self, pontos, estilo="D"):
+        # estilo: "D" contorno, "F" preenchimento, "DF" os dois (como em FPDF.rect)
+        caminho = [f"{self.ponto_pdf(*pontos[0])} m"] + [f"{self.ponto_pdf(x, y)} l" for x, y in pontos[1:]]
+        self._out(" ".join(caminho) + " h " + self.operador_pintura(estilo))
+
+    def circulo(self, cx, cy, r, estilo="D"):
+        c = KAPPA_CIRCULO * r
+        p = self.ponto_pdf
+        self._out(
+            f"{p(cx + r, cy)} m "
+            f"{p(cx + r, cy - c)} {p(cx + c, cy - r)} {p(cx, cy - r)} c "
+            f"{p(cx - c, cy - r)} {p(cx - r, cy - c)} {p(cx - r, cy)} c "
+            f"{p(cx - r, cy + c)} {p(cx - c, cy + r)} {p(cx, cy + r)} c "
+            f"{p(cx + c, cy + r)} {p(cx + r, cy + c)} {p(cx + r, cy)} c "
+            f"h {self.operador_pintura(estilo)}"
+        )
+
+    def grafico_radar(self, notas_convertidas, criterios=CRITERIOS, x=None, y=None, w=150):
+        # Radar das notas convertidas (0..1) numa caixa de largura w a partir de (x, y),
+        # avançando o cursor como FPDF.image; um eixo por critério, grade a cada 0,25
+        x = self.l_margin if x is None else x
+        altura = w * 0.8
+        if y is None:
+            if self.y + altura > self.page_break_trigger and not self.in_footer and self.accept_page_break():
+                self.add_page(self.cur_orientation)
+            y = self.y
+        cx, cy = x + w / 2, y + altura / 2
+        raio = altura / 2 - 12
+        angulos = [2 * math.pi * i / len(criterios) for i in range(len(criterios))]
+
+        def ponto(angulo, valor):
+            return cx + raio * valor * math.cos(angulo), cy - raio * valor * math.sin(angulo)
+
+        contorno = [ponto(a, notas_convertidas[c]) for a, c in zip(angulos, criterios)]
+        self.set_fill_color(214, 229, 242)
+        self.poligono(contorno, "F")
+
+        self.set_draw_color(190, 190, 190)
+        self.set_line_width(0.2)
+        for nivel in (0.25, 0.5, 0.75, 1.0):
+            self.circulo(cx, cy, raio * nivel)
+        for angulo in angulos:
+            self.line(cx, cy, *ponto(angulo, 1.0))
+
+        self.set_draw_color(31, 119, 180)
+        self.set_line_width(0.5)
+        self.poligono(contorno)
+
+        self.set_font("Arial", "", 6)
+        self.set_text_color(120, 120, 120)
+        for nivel in (0.25, 0.5, 0.75, 1.0):
+            self.text(cx + raio * nivel + 0.5, cy + 2.5, f"{nivel:.2f}")
+
+        self.set_font("Arial", "", 7)
+        self.set_text_color(0, 0, 0)
+        altura_linha = 3
+        for angulo, criterio in zip(angulos, criterios):
+            linhas = textwrap.wrap(criterio, 24)
+            lx, ly = ponto(angulo, 1.0 + 3 / raio)
+            cosseno, seno = math.cos(angulo), math.sin(angulo)
+            # Centraliza o bloco de linhas na vertical, deslocado para fora do círculo em cima e embaixo
+            topo = ly - len(linhas) * altura_linha / 2 - seno * len(linhas) * altura_linha / 2
+            for i, linha in enumerate(linhas):
+                largura = self.get_string_width(linha)
+                if cosseno > 0.2:
+                    tx = lx
+                elif cosseno < -0.2:
+                    tx = lx - largura
+                else:
+                    tx = lx - largura / 2
+                self.text(tx, topo + (i + 0.8) * altura_linha, linha)
+
+        self.set_draw_color(0, 0, 0)
+        self.set_fill_color(255, 255, 255)
+        self.set_line_width(0.2)
+        self.x = self.l_margin
+        self.y = y + altura
+
+
+class RelatorioICC(GraficosPDF, FPDF):
+    def header(self):
+        if os.path.exists(logo_path):
+            self.image(logo_path, 10, 8, 30)
+        self.set_font("Arial", "B", 14)
+        self.cell(0, 10, "Grupo de Pesquisa Cidadania e Diversidade Social", ln=True, align="C")
+        self.set_font("Arial", "", 12)
+        self.cell(0, 10, "Centro Universitário UniCarioca Digital", ln=True, align="C")
+        self.ln(5)
+
+    def chapter_title(self, title):
+        self.set_font("Arial", "B", 12)
+        self.set_text_color(0, 51, 102)
+        self.cell(0, 10, title, ln=True)
+        self.set_text_color(0, 0, 0)
+
+    def chapter_body(self, text):
+        self.set_font("Arial", "", 11)
+        self.multi_cell(0, 10, text)
+        self.ln()
+
+
+def pdf_em_bytes(pdf):
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def pdf_memorizado(estado, entradas, gerar=None):
+    # PDF da sessão (estado = st.session_state) guardado junto com as entradas exatas do
+    # relatório. Sem `gerar`, só devolve o PDF já gerado para essas entradas, ou None;
+    # com `gerar`, monta-o se preciso. Reexecuções que não mudam as entradas não geram nada.
+    guardado = estado.get("relatorio_pdf")
+    if guardado is not None and guardado[0] == entradas:
+        return guardado[1]
+    if gerar is None:
+        return None
+    dados = gerar()
+    estado["relatorio_pdf"] = (entradas, dados)
+    return dados
+
+
+def gerar_relatorio_pdf(nome, tema, notas, pesos, atividades=(), criterios=CRITERIOS):
+    # notas e pesos são dicionários indexados pelo critério; devolve o PDF em bytes
+    icc = calcular_icc(notas, pesos, criterios)
+    pdf = RelatorioICC()
+    pdf.add_page()
+    pdf.chapter_title("Dados da Avaliação")
+    pdf.chapter_body(f"Nome: {nome}\nTemática: {tema}\nICC: {icc:.3f}\n{interpretar_icc(icc)}")
+    pdf.chapter_title("Notas e Pesos por Critério")
+    for c in criterios:
+        pdf.chapter_body(f"- {c}: Nota {notas[c]}, Peso {pesos[c]}")
+    pdf.chapter_title("Gráfico Radar")
+    pdf.grafico_radar({c: converter_nota(notas[c]) for c in criterios}, criterios, x=30, w=150)
+    if atividades:
+        pdf.chapter_title("Atividades Sugeridas")
+        for a in atividades:
+            pdf.chapter_body(f"- {a}")
+    return pdf_em_bytes(pdf)
@@ -0,0 +1,75 @@
+import os
+import re
+import time
+import unicodedata
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from icc.relatorio import gerar_relatorio_pdf
+
+
+def nome_arquivo_relatorio(indice, nome):
+    slug = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode("ascii")
+    slug = re.sub(r"[^a-z0-9]+", "_", slug.lower()).strip("_")[:40] or "sem_nome"
+    return f"relatorio_icc_{indice:05d}_{slug}.pdf"
+
+
+def _gerar_relatorio(tarefa):
+    indice, nome, tema, notas, pesos, atividades = tarefa
+    return nome_arquivo_relatorio(indice, nome), gerar_relatorio_pdf(nome, tema, notas, pesos, atividades)
+
+
+def _gerar_bloco(bloco):
+    return [_gerar_relatorio(tarefa) for tarefa in bloco]
+
+
+def relatorios_em_janela(executor, tarefas, tamanho_bloco, janela):
+    # Como executor.map, mas sem enviar tudo de uma vez: lê as tarefas aos poucos e mantém
+    # no máximo `janela` blocos de `tamanho_bloco` em andamento. Devolve na ordem das tarefas.
+    tarefas = iter(tarefas)
+    pendentes = deque()
+    while True:
+        bloco = list(islice(tarefas, tamanho_bloco))
+        if not bloco:
+            break
+        pendentes.append(executor.submit(_gerar_bloco, bloco))
+        if len(pendentes) >= janela:
+            yield from pendentes.popleft().result()
+    while pendentes:
+        yield from pendentes.popleft().result()
+
+
+def gerar_relatorios(tarefas, destino, trabalhadores=None, tamanho_bloco=4, progresso=None):
+    # tarefas: iterável de (indice, nome, tema, notas, pesos, atividades), consumido aos poucos.
+    # destino terminado em .zip gera um único arquivo compactado; caso contrário, uma pasta de PDFs.
+    # `progresso(total)` é chamado a cada bloco gravado.
+    destino = Path(destino)
+    inicio = time.perf_counter()
+    total = 0
+    janela = 2 * (trabalhadores or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=trabalhadores) as executor:
+        relatorios = relatorios_em_janela(executor, tarefas, tamanho_bloco, janela)
+        if destino.suffix == ".zip":
+            arquivo_zip = zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_DEFLATED)
+            gravar = arquivo_zip.writestr
+        else:
+            arquivo_zip = None
+            destino.mkdir(parents=True, exist_ok=True)
+
+            def gravar(nome_arquivo, conteudo):
+                (destino / nome_arquivo).write_bytes(conteudo)
+        try:
+            for nome_arquivo, conteudo in relatorios:
+                gravar(nome_arquivo, conteudo)
+                total += 1
+                if progresso and total % tamanho_bloco == 0:
+                    progresso(total)
+        finally:
+            if arquivo_zip is not None:
+                arquivo_zip.close()
+    if progresso:
+        progresso(total)
+    return total, time.perf_counter() - inicio
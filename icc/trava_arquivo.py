@@ -0,0 +1,46 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # Sem fcntl (Windows) a trava só vale entre as threads do processo
+    fcntl = None
+
+
+class TravaArquivo:
+    # Trava exclusiva sobre `caminho`, entre processos (flock) e entre as threads do
+    # processo. Reentrante na mesma thread: o flock só é pedido na entrada mais externa,
+    # porque dois descritores abertos pelo mesmo processo também se bloqueiam entre si.
+    # O arquivo é criado vazio se não existir e só é aberto para leitura.
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.trava = threading.RLock()
+        self.profundidade = 0
+        self.descritor = None
+
+    def __enter__(self):
+        self.trava.acquire()
+        if self.profundidade == 0:
+            try:
+                self.descritor = os.open(self.caminho, os.O_RDONLY | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    fcntl.flock(self.descritor, fcntl.LOCK_EX)
+            except BaseException:
+                if self.descritor is not None:
+                    os.close(self.descritor)
+                    self.descritor = None
+                self.trava.release()
+                raise
+        self.profundidade += 1
+        return self
+
+    def __exit__(self, tipo, valor, rastreamento):
+        self.profundidade -= 1
+        if self.profundidade == 0:
+            # Fechar o descritor libera o flock
+            os.close(self.descritor)
+            self.descritor = None
+        self.trava.release()
+        return False
@@ -1,5 +1,6 @@
 
 import streamlit as st
+from icc.pontuacao import calcular_icc
 
 # Título
 st.title("Índice de Contribuição Cidadã (ICC)")
@@ -20,15 +21,6 @@ criterios_pesos = {
     "Cidadania digital": 0.6
 }
 
-# Conversão da nota para a escala [0, 1]
-def converter_nota(nota):
-    return {
-        4: 1.0,
-        3: 0.75,
-        2: 0.5,
-        1: 0.25
-    }.get(nota, 0)
-
 notas_usuario = {}
 with st.form("form_icc"):
     for criterio in criterios_pesos:
@@ -42,14 +34,6 @@ with st.form("form_icc"):
 
 # Cálculo e resultado
 if submitted:
-    numerador = 0
-    denominador = 0
-
-    for criterio, peso in criterios_pesos.items():
-        nota_convertida = converter_nota(notas_usuario[criterio])
-        numerador += nota_convertida * peso
-        denominador += peso
-
-    icc = numerador / denominador
+    icc = calcular_icc(notas_usuario, criterios_pesos)
     st.success(f"Índice de Contribuição Cidadã (ICC): {icc:.3f}")
     st.progress(icc)
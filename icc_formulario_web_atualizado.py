@@ -1,6 +1,7 @@
 
 import streamlit as st
 import plotly.graph_objects as go
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
 
 # Título
 st.title("Índice de Contribuição Cidadã (ICC)")
@@ -21,15 +22,6 @@ criterios_pesos = {
     "Cidadania digital": 0.6
 }
 
-# Conversão da nota para a escala [0, 1]
-def converter_nota(nota):
-    return {
-        4: 1.0,
-        3: 0.75,
-        2: 0.5,
-        1: 0.25
-    }.get(nota, 0)
-
 notas_usuario = {}
 with st.form("form_icc"):
     for criterio in criterios_pesos:
@@ -42,29 +34,10 @@ with st.form("form_icc"):
     submitted = st.form_submit_button("Calcular ICC")
 
 # Interpretação automática do ICC
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
 # Cálculo e resultado
 if submitted:
-    numerador = 0
-    denominador = 0
-    notas_convertidas = {}
-
-    for criterio, peso in criterios_pesos.items():
-        nota_convertida = converter_nota(notas_usuario[criterio])
-        notas_convertidas[criterio] = nota_convertida
-        numerador += nota_convertida * peso
-        denominador += peso
-
-    icc = numerador / denominador
+    notas_convertidas = {c: converter_nota(notas_usuario[c]) for c in criterios_pesos}
+    icc = calcular_icc(notas_usuario, criterios_pesos)
 
     st.success(f"Índice de Contribuição Cidadã (ICC): {icc:.3f}")
     st.info(interpretar_icc(icc))
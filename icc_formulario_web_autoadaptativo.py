@@ -4,15 +4,18 @@ import plotly.graph_objects as go
 from fpdf import FPDF
 import matplotlib.pyplot as plt
 import os
-import json
-from difflib import get_close_matches
 from pathlib import Path
+from icc.banco import servico_banco
+from icc.cache import sugestoes_em_cache
+from icc.corretor import CorretorOrtografico
+from icc.indice_trigramas import IndiceTrigramas
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 path_temas = Path("temas_sugeridos.json")
 
 # Base inicial
-tematicas_atividades = {
+tematicas_iniciais = {
     "educação sexual": [
         "Rodas de conversa sobre identidade de gênero e sexualidade",
         "Cartazes educativos sobre respeito e prevenção"
@@ -23,22 +26,16 @@ tematicas_atividades = {
     ]
 }
 
-# Carregar temáticas salvas
-if path_temas.exists():
-    with open(path_temas, "r", encoding="utf-8") as f:
-        tematicas_atividades.update(json.load(f))
+# Temáticas compartilhadas pelo processo: só são relidas do disco quando o arquivo muda
+servico = servico_banco(path_temas, tematicas_iniciais)
+tematicas_atividades = servico.obter()
+indice_tematicas = tematicas_atividades.derivado("indice_trigramas", IndiceTrigramas)
+corretor_temas = tematicas_atividades.derivado("corretor", CorretorOrtografico)
 
 def salvar_nova_tematica(tema_novo, atividades_sugeridas):
-    if path_temas.exists():
-        with open(path_temas, "r", encoding="utf-8") as f:
-            base = json.load(f)
-    else:
-        base = {}
     tema_key = tema_novo.strip().lower()
-    if tema_key not in base:
-        base[tema_key] = atividades_sugeridas
-        with open(path_temas, "w", encoding="utf-8") as f:
-            json.dump(base, f, indent=2, ensure_ascii=False)
+    if tema_key not in tematicas_atividades:
+        servico.salvar({tema_key: atividades_sugeridas})
 
 criterios = [
     "Promoção da equidade e inclusão",
@@ -54,20 +51,7 @@ criterios = [
     "Cidadania digital"
 ]
 
-impacto_base = {atividade: 0.75 for lista in tematicas_atividades.values() for atividade in lista}
-
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}[nota]
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
+impacto_base = {atividade: 0.75 for dados in tematicas_atividades.values() for atividade in dados["atividades"]}
 
 st.title("ICC - Índice de Contribuição Cidadã (Autoaprendizagem)")
 
@@ -89,29 +73,23 @@ with st.form("formulario_icc"):
     enviado = st.form_submit_button("Calcular ICC")
 
 if enviado and nome and tema:
-    numerador, denominador = 0, 0
-    notas_convertidas = {}
-    for crit in criterios:
-        nota = converter_nota(notas_usuario[crit])
-        peso = pesos_usuario[crit]
-        notas_convertidas[crit] = nota
-        numerador += nota * peso
-        denominador += peso
-
-    icc = numerador / denominador
+    notas_convertidas = {c: converter_nota(notas_usuario[c]) for c in criterios}
+    icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
     st.success(f"ICC de {nome}: {icc:.3f}")
     st.info(interpretar_icc(icc))
 
     # Sugestões inteligentes
-    palavras = tema.lower().split()
-    matches = set()
-    for p in palavras:
-        similares = get_close_matches(p, tematicas_atividades.keys(), n=1, cutoff=0.3)
-        matches.update(similares)
+    def temas_aproximados(tema_normalizado):
+        matches = set()
+        for p in corretor_temas.corrigir(tema_normalizado).split():
+            matches.update(indice_tematicas.aproximados(p, n=1, cutoff=0.3))
+        return frozenset(matches)
+
+    matches = sugestoes_em_cache(path_temas, "temas_aproximados", tema, temas_aproximados, tematicas_atividades.versao)
 
     sugestoes = []
     for match in matches:
-        for a in tematicas_atividades[match]:
+        for a in tematicas_atividades[match]["atividades"]:
             sugestoes.append((match, a, impacto_base.get(a, 0.5)))
 
     st.markdown("### Sugestões Inteligentes por Temática Aproximada")
@@ -2,13 +2,16 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from fpdf import FPDF
-import matplotlib.pyplot as plt
 import os
+from icc.aho_corasick import AutomatoGatilhos
+from icc.banco import PATH_COLABORATIVO, servico_banco, unir_bancos
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
+from icc.relatorio import GraficosPDF, pdf_em_bytes
 
 # Base de temáticas com palavras-chave
 tematicas_semantico = {
     "educação antirracista": {
-        "gatilhos": ["racismo", "racial", "etnia", "afro", "preto", "negritude", "preconceito", "discriminação", "antirracista"],
+        "keywords": ["racismo", "racial", "etnia", "afro", "preto", "negritude", "preconceito", "discriminação", "antirracista"],
         "atividades": [
             "Rodas de conversa sobre identidade racial",
             "Produção de murais antirracistas",
@@ -20,6 +23,16 @@ tematicas_semantico = {
     }
 }
 
+# Gatilhos desta base somados aos do banco colaborativo (a mesma temática nos dois fica com
+# gatilhos e atividades de ambos). O autômato fica na fotografia do banco compartilhada pelo
+# processo e só é recompilado quando o banco muda, não a cada reexecução.
+servico = servico_banco(PATH_COLABORATIVO)
+automato_gatilhos = servico.obter().derivado(
+    "automato_associacao_semantica",
+    lambda banco: AutomatoGatilhos(unir_bancos(tematicas_semantico, banco))
+)
+banco_semantico = automato_gatilhos.banco
+
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 
 criterios = [
@@ -36,20 +49,7 @@ criterios = [
     "Cidadania digital"
 ]
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}[nota]
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
-class RelatorioICC(FPDF):
+class RelatorioICC(GraficosPDF, FPDF):
     def header(self):
         if os.path.exists(logo_path):
             self.image(logo_path, 10, 8, 30)
@@ -90,31 +90,22 @@ with st.form("avaliacao_icc"):
     enviado = st.form_submit_button("Calcular ICC")
 
 if enviado and nome and tema:
-    numerador, denominador = 0, 0
-    notas_convertidas = {}
-    for crit in criterios:
-        nota = converter_nota(notas_usuario[crit])
-        peso = pesos_usuario[crit]
-        notas_convertidas[crit] = nota
-        numerador += nota * peso
-        denominador += peso
-
-    icc = numerador / denominador
+    notas_convertidas = {c: converter_nota(notas_usuario[c]) for c in criterios}
+    icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
     st.success(f"ICC de {nome}: {icc:.3f}")
     st.info(interpretar_icc(icc))
 
     # Sugestões por associação semântica
-    tema_detectado = None
+    temas_detectados = automato_gatilhos.temas_encontrados(tema)
     atividades_sugeridas = []
-
-    for tema_ref, dados in tematicas_semantico.items():
-        if any(gatilho in tema.lower() for gatilho in dados["gatilhos"]):
-            tema_detectado = tema_ref
-            atividades_sugeridas = dados["atividades"]
-            break
+    for tema_ref in temas_detectados:
+        atividades_sugeridas.extend(banco_semantico[tema_ref]["atividades"])
 
     st.markdown("### Sugestões de Atividades Associadas")
     if atividades_sugeridas:
+        for tema_ref, ocorrencias in temas_detectados.items():
+            gatilhos = ", ".join(f"'{padrao}' (posição {inicio})" for inicio, _, padrao, _ in ocorrencias)
+            st.caption(f"{tema_ref.title()}: {gatilhos}")
         df_sug = pd.DataFrame({"Atividades sugeridas": atividades_sugeridas})
         st.dataframe(df_sug)
     else:
@@ -132,17 +123,6 @@ if enviado and nome and tema:
     st.plotly_chart(fig)
 
     # Gerar PDF
-    radar_vals = list(notas_convertidas.values()) + [list(notas_convertidas.values())[0]]
-    radar_labels = criterios + [criterios[0]]
-    fig2, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.plot(radar_vals, linewidth=1, linestyle='solid')
-    ax.fill(radar_vals, 'b', alpha=0.1)
-    ax.set_xticks([i * 2 * 3.14159 / len(radar_labels) for i in range(len(radar_labels))])
-    ax.set_xticklabels(radar_labels, fontsize=8)
-    radar_path = "/tmp/grafico_icc_semantico.png"
-    plt.savefig(radar_path)
-    plt.close()
-
     pdf = RelatorioICC()
     pdf.add_page()
     pdf.chapter_title("Dados da Avaliação")
@@ -152,14 +132,11 @@ if enviado and nome and tema:
     for crit in criterios:
         pdf.chapter_body(f"- {crit}: Nota {notas_usuario[crit]}, Peso {pesos_usuario[crit]}")
     pdf.chapter_title("Gráfico de Desempenho")
-    pdf.image(radar_path, x=30, w=150)
+    pdf.grafico_radar(notas_convertidas, list(notas_convertidas), x=30, w=150)
     pdf.chapter_title("Sugestões de Atividades Associadas")
     if atividades_sugeridas:
         for atividade in atividades_sugeridas:
             pdf.chapter_body(f"- {atividade}")
     else:
         pdf.chapter_body("Nenhuma associação semântica encontrada para a temática.")
-    pdf_path = "/tmp/relatorio_icc_semantico.pdf"
-    pdf.output(pdf_path)
-    with open(pdf_path, "rb") as f:
-        st.download_button("📥 Baixar Relatório PDF", f, file_name="relatorio_icc_semantico.pdf")
\ No newline at end of file
+    st.download_button("📥 Baixar Relatório PDF", pdf_em_bytes(pdf), file_name="relatorio_icc_semantico.pdf", mime="application/pdf")
\ No newline at end of file
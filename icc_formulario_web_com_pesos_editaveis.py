@@ -2,8 +2,9 @@ import streamlit as st
 import plotly.graph_objects as go
 from fpdf import FPDF
 import os
-import matplotlib.pyplot as plt
 import pandas as pd
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
+from icc.relatorio import GraficosPDF, pdf_em_bytes
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 
@@ -30,20 +31,7 @@ pesos_usuario = {}
 for crit in criterios:
     pesos_usuario[crit] = st.number_input(f"Peso - {crit}", min_value=0.1, max_value=2.0, value=1.0, step=0.1)
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}.get(nota, 0)
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
-class RelatorioICC(FPDF):
+class RelatorioICC(GraficosPDF, FPDF):
     def header(self):
         if os.path.exists(logo_path):
             self.image(logo_path, 10, 8, 30)
@@ -75,18 +63,8 @@ with st.form("form_icc"):
     submitted = st.form_submit_button("Calcular ICC")
 
 if submitted and nome and tema:
-    numerador = 0
-    denominador = 0
-    notas_convertidas = {}
-
-    for criterio in criterios:
-        nota_convertida = converter_nota(notas_usuario[criterio])
-        peso = pesos_usuario[criterio]
-        notas_convertidas[criterio] = nota_convertida
-        numerador += nota_convertida * peso
-        denominador += peso
-
-    icc = numerador / denominador
+    notas_convertidas = {c: converter_nota(notas_usuario[c]) for c in criterios}
+    icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
     interpretacao = interpretar_icc(icc)
 
     st.success(f"ICC de {nome} sobre '{tema}': {icc:.3f}")
@@ -113,19 +91,6 @@ if submitted and nome and tema:
     })
     st.dataframe(df_pesos)
 
-    radar_labels = list(notas_convertidas.keys())
-    radar_vals = list(notas_convertidas.values())
-    radar_vals.append(radar_vals[0])
-    radar_labels.append(radar_labels[0])
-    fig2, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.plot(radar_vals, linewidth=1, linestyle='solid')
-    ax.fill(radar_vals, 'b', alpha=0.1)
-    ax.set_xticks([i * 2 * 3.14159 / len(radar_labels) for i in range(len(radar_labels))])
-    ax.set_xticklabels(radar_labels, fontsize=8)
-    radar_path = "/tmp/grafico_icc_peso_radar.png"
-    plt.savefig(radar_path)
-    plt.close()
-
     pdf = RelatorioICC()
     pdf.add_page()
     pdf.chapter_title("Dados da Avaliação")
@@ -135,8 +100,5 @@ if submitted and nome and tema:
     for crit in criterios:
         pdf.chapter_body(f"- {crit}: Nota {notas_usuario[crit]}, Peso {pesos_usuario[crit]}")
     pdf.chapter_title("Gráfico de Desempenho")
-    pdf.image(radar_path, x=30, w=150)
-    pdf_path = "/tmp/relatorio_icc_com_peso.pdf"
-    pdf.output(pdf_path)
-    with open(pdf_path, "rb") as f:
-        st.download_button("📥 Baixar Relatório PDF com Pesos", f, file_name="relatorio_icc_com_peso.pdf")
\ No newline at end of file
+    pdf.grafico_radar(notas_convertidas, list(notas_convertidas), x=30, w=150)
+    st.download_button("📥 Baixar Relatório PDF com Pesos", pdf_em_bytes(pdf), file_name="relatorio_icc_com_peso.pdf", mime="application/pdf")
\ No newline at end of file
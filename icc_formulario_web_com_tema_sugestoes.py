@@ -5,6 +5,7 @@ import os
 import matplotlib.pyplot as plt
 from difflib import get_close_matches
 import pandas as pd
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 
@@ -66,19 +67,6 @@ atividades_por_criterio = {
     ]
 }
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}.get(nota, 0)
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
 class RelatorioICC(FPDF):
     def header(self):
         if os.path.exists(logo_path):
@@ -111,17 +99,8 @@ with st.form("form_icc"):
     submitted = st.form_submit_button("Calcular ICC")
 
 if submitted and nome and tema:
-    numerador = 0
-    denominador = 0
-    notas_convertidas = {}
-
-    for criterio, peso in criterios_pesos.items():
-        nota_convertida = converter_nota(notas_usuario[criterio])
-        notas_convertidas[criterio] = nota_convertida
-        numerador += nota_convertida * peso
-        denominador += peso
-
-    icc = numerador / denominador
+    notas_convertidas = {c: converter_nota(notas_usuario[c]) for c in criterios_pesos}
+    icc = calcular_icc(notas_usuario, criterios_pesos)
     interpretacao = interpretar_icc(icc)
 
     st.success(f"ICC de {nome} sobre '{tema}': {icc:.3f}")
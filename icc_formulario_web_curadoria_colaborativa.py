@@ -4,8 +4,9 @@ import plotly.graph_objects as go
 from fpdf import FPDF
 import matplotlib.pyplot as plt
 import os
-import json
 from pathlib import Path
+from icc.banco import servico_banco
+from icc.pontuacao import calcular_icc, interpretar_icc
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 path_base_colaborativa = Path("temas_sugeridos_colaborativos.json")
@@ -38,19 +39,6 @@ atividades_sugeridas_genericas = {
     "Cidadania digital": "Campanha educativa sobre cyberbullying e fake news"
 }
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}[nota]
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
 class RelatorioICC(FPDF):
     def header(self):
         if os.path.exists(logo_path):
@@ -92,9 +80,7 @@ with st.form("avaliacao_icc"):
     enviado = st.form_submit_button("Calcular ICC")
 
 if enviado and nome and tema:
-    numerador = sum(converter_nota(notas_usuario[c]) * pesos_usuario[c] for c in criterios)
-    denominador = sum(pesos_usuario[c] for c in criterios)
-    icc = numerador / denominador
+    icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
     st.success(f"ICC: {icc:.3f}")
     st.info(interpretar_icc(icc))
 
@@ -107,14 +93,6 @@ if enviado and nome and tema:
             sugestoes_curadas.append(atividade)
 
     if sugestoes_curadas and st.button("Salvar temática e atividades selecionadas"):
-        if path_base_colaborativa.exists():
-            with open(path_base_colaborativa, "r", encoding="utf-8") as f:
-                base = json.load(f)
-        else:
-            base = {}
-
         tema_key = tema.strip().lower()
-        base[tema_key] = sugestoes_curadas
-        with open(path_base_colaborativa, "w", encoding="utf-8") as f:
-            json.dump(base, f, indent=2, ensure_ascii=False)
+        servico_banco(path_base_colaborativa).salvar({tema_key: sugestoes_curadas})
         st.success(f"Temática '{tema}' salva com {len(sugestoes_curadas)} atividade(s) marcadas.")
\ No newline at end of file
@@ -2,9 +2,13 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from fpdf import FPDF
-import matplotlib.pyplot as plt
 import os
-from difflib import get_close_matches
+from icc.busca_bm25 import BuscadorBM25
+from icc.cache import sugestoes_em_cache
+from icc.corretor import CorretorOrtografico
+from icc.indice_trigramas import IndiceTrigramas
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
+from icc.relatorio import GraficosPDF, pdf_em_bytes
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 
@@ -41,19 +45,6 @@ with st.form("form_avaliacao"):
             notas_usuario[crit] = st.selectbox("Nota", options=[4, 3, 2, 1], key=f"nota_{crit}")
     submitted = st.form_submit_button("Calcular ICC")
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}[nota]
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
 tematicas_atividades = {
     "educação sexual": [
         "Rodas de conversa sobre identidade de gênero e sexualidade",
@@ -92,6 +83,10 @@ tematicas_atividades = {
     ]
 }
 
+indice_tematicas = IndiceTrigramas(tematicas_atividades)
+corretor_temas = CorretorOrtografico(tematicas_atividades)
+buscador_temas = BuscadorBM25(tematicas_atividades)
+
 impacto_base = {
     "Rodas de conversa sobre identidade de gênero e sexualidade": 0.9,
     "Cartazes educativos sobre respeito e prevenção": 0.8,
@@ -116,7 +111,7 @@ impacto_base = {
     "Mentorias com foco em deficiência": 0.9
 }
 
-class RelatorioICC(FPDF):
+class RelatorioICC(GraficosPDF, FPDF):
     def header(self):
         if os.path.exists(logo_path):
             self.image(logo_path, 10, 8, 30)
@@ -138,33 +133,27 @@ class RelatorioICC(FPDF):
         self.ln()
 
 if submitted and nome and tema:
-    numerador = 0
-    denominador = 0
-    notas_convertidas = {}
-    for criterio in criterios:
-        nota_convertida = converter_nota(notas_usuario[criterio])
-        peso = pesos_usuario[criterio]
-        notas_convertidas[criterio] = nota_convertida
-        numerador += nota_convertida * peso
-        denominador += peso
-
-    icc = numerador / denominador
+    notas_convertidas = {c: converter_nota(notas_usuario[c]) for c in criterios}
+    icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
     interpretacao = interpretar_icc(icc)
 
     st.success(f"ICC de {nome} sobre '{tema}': {icc:.3f}")
     st.info(interpretacao)
 
-    sugestoes_semanticas = []
-    palavras_tema = tema.lower().split()
-    for palavra in palavras_tema:
-        matches = get_close_matches(palavra, tematicas_atividades.keys(), n=2, cutoff=0.3)
-        for match in matches:
-            for atividade in tematicas_atividades[match]:
-                sugestoes_semanticas.append((match, atividade, impacto_base.get(atividade, 0.5)))
+    # A consulta BM25 inclui as temáticas aproximadas de cada palavra digitada
+    def ranquear_sugestoes(tema_normalizado):
+        tema_corrigido = corretor_temas.corrigir(tema_normalizado)
+        consulta = [tema_corrigido]
+        for palavra in tema_corrigido.split():
+            consulta.extend(indice_tematicas.aproximados(palavra, n=2, cutoff=0.3))
+        return tuple(buscador_temas.ranquear_atividades(" ".join(consulta), impacto_base))
+
+    ranking = sugestoes_em_cache(__file__, "ranquear_sugestoes", tema, ranquear_sugestoes)
+    sugestoes_semanticas = [(match, atividade, impacto) for match, atividade, _, impacto, _ in ranking]
 
     if sugestoes_semanticas:
-        df_sugestoes = pd.DataFrame(sugestoes_semanticas, columns=["Temática aproximada", "Atividade sugerida", "Impacto estimado"])
-        df_sugestoes = df_sugestoes.sort_values(by="Impacto estimado", ascending=False)
+        df_sugestoes = pd.DataFrame(ranking, columns=["Temática aproximada", "Atividade sugerida", "Relevância", "Impacto estimado", "Pontuação"])
+        df_sugestoes = df_sugestoes.round(3)
         st.dataframe(df_sugestoes)
     else:
         st.warning("Nenhuma sugestão automática foi encontrada com base na temática digitada.")
@@ -181,17 +170,6 @@ if submitted and nome and tema:
     st.plotly_chart(fig, use_container_width=True)
 
     # Gerar PDF
-    radar_vals = list(notas_convertidas.values()) + [list(notas_convertidas.values())[0]]
-    radar_labels = criterios + [criterios[0]]
-    fig2, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.plot(radar_vals, linewidth=1, linestyle='solid')
-    ax.fill(radar_vals, 'b', alpha=0.1)
-    ax.set_xticks([i * 2 * 3.14159 / len(radar_labels) for i in range(len(radar_labels))])
-    ax.set_xticklabels(radar_labels, fontsize=8)
-    radar_path = "/tmp/grafico_icc_ranking.png"
-    plt.savefig(radar_path)
-    plt.close()
-
     pdf = RelatorioICC()
     pdf.add_page()
     pdf.chapter_title("Dados da Avaliação")
@@ -201,14 +179,11 @@ if submitted and nome and tema:
     for crit in criterios:
         pdf.chapter_body(f"- {crit}: Nota {notas_usuario[crit]}, Peso {pesos_usuario[crit]}")
     pdf.chapter_title("Gráfico de Desempenho")
-    pdf.image(radar_path, x=30, w=150)
+    pdf.grafico_radar(notas_convertidas, list(notas_convertidas), x=30, w=150)
     pdf.chapter_title("Sugestões por Temática Aproximada e Impacto Estimado:")
     if sugestoes_semanticas:
         for tema, atividade, impacto in sugestoes_semanticas:
             pdf.chapter_body(f"{tema} - {atividade} (Impacto estimado: {impacto})")
     else:
         pdf.chapter_body("Nenhuma sugestão automática foi encontrada com base na temática digitada.")
-    pdf_path = "/tmp/relatorio_icc_tema_final.pdf"
-    pdf.output(pdf_path)
-    with open(pdf_path, "rb") as f:
-        st.download_button("📥 Baixar Relatório PDF", f, file_name="relatorio_icc_tema_final.pdf")
\ No newline at end of file
+    st.download_button("📥 Baixar Relatório PDF", pdf_em_bytes(pdf), file_name="relatorio_icc_tema_final.pdf", mime="application/pdf")
\ No newline at end of file
@@ -2,10 +2,11 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from fpdf import FPDF
-import matplotlib.pyplot as plt
 import os
-import json
 from pathlib import Path
+from icc.banco import servico_banco
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
+from icc.relatorio import GraficosPDF, pdf_em_bytes
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 path_colaborativo = Path("temas_sugeridos_colaborativos.json")
@@ -26,20 +27,7 @@ atividades_genericas = {
 
 criterios = list(atividades_genericas.keys())
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}[nota]
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
-class RelatorioICC(FPDF):
+class RelatorioICC(GraficosPDF, FPDF):
     def header(self):
         if os.path.exists(logo_path):
             self.image(logo_path, 10, 8, 30)
@@ -82,7 +70,7 @@ with st.form("icc_form"):
 atividades_curadas = []
 
 if submit and nome and tema:
-    icc = sum(converter_nota(notas_usuario[c]) * pesos_usuario[c] for c in criterios) / sum(pesos_usuario.values())
+    icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
     st.success(f"ICC: {icc:.3f}")
     st.info(interpretar_icc(icc))
 
@@ -96,17 +84,6 @@ if submit and nome and tema:
     fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])), showlegend=False)
     st.plotly_chart(fig)
 
-    radar_vals = [converter_nota(notas_usuario[c]) for c in criterios] + [converter_nota(notas_usuario[criterios[0]])]
-    radar_labels = criterios + [criterios[0]]
-    fig2, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.plot(radar_vals, linewidth=1)
-    ax.fill(radar_vals, alpha=0.1)
-    ax.set_xticks([i * 2 * 3.14159 / len(radar_labels) for i in range(len(radar_labels))])
-    ax.set_xticklabels(radar_labels, fontsize=8)
-    radar_path = "/tmp/grafico_icc_checkbox.png"
-    plt.savefig(radar_path)
-    plt.close()
-
     st.markdown("### Sugestões de Atividades Relacionadas à Temática da Pesquisa que possam contribuir com o ICC")
     st.write("Marque as atividades que considera relevantes:")
 
@@ -116,14 +93,7 @@ if submit and nome and tema:
             atividades_marcadas.append(atividade)
 
     if st.button("Salvar atividades selecionadas"):
-        if path_colaborativo.exists():
-            with open(path_colaborativo, "r", encoding="utf-8") as f:
-                base = json.load(f)
-        else:
-            base = {}
-        base[tema.lower()] = atividades_marcadas
-        with open(path_colaborativo, "w", encoding="utf-8") as f:
-            json.dump(base, f, indent=2, ensure_ascii=False)
+        servico_banco(path_colaborativo).salvar({tema.lower(): atividades_marcadas})
         st.success(f"As seguintes atividades foram salvas para a temática '{tema}':\n- " + "\n- ".join(atividades_marcadas))
 
     pdf = RelatorioICC()
@@ -134,12 +104,9 @@ if submit and nome and tema:
     for c in criterios:
         pdf.chapter_body(f"- {c}: Nota {notas_usuario[c]}, Peso {pesos_usuario[c]}")
     pdf.chapter_title("Gráfico Radar")
-    pdf.image(radar_path, x=30, w=150)
+    pdf.grafico_radar({c: converter_nota(notas_usuario[c]) for c in criterios}, criterios, x=30, w=150)
     if atividades_marcadas:
         pdf.chapter_title("Atividades Curadas Selecionadas")
         for a in atividades_marcadas:
             pdf.chapter_body(f"- {a}")
-    pdf_path = "/tmp/relatorio_icc_checkbox.pdf"
-    pdf.output(pdf_path)
-    with open(pdf_path, "rb") as f:
-        st.download_button("📥 Baixar Relatório PDF", f, file_name="relatorio_icc_checkbox.pdf")
\ No newline at end of file
+    st.download_button("📥 Baixar Relatório PDF", pdf_em_bytes(pdf), file_name="relatorio_icc_checkbox.pdf", mime="application/pdf")
\ No newline at end of file
@@ -2,10 +2,11 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from fpdf import FPDF
-import matplotlib.pyplot as plt
 import os
-import json
 from pathlib import Path
+from icc.banco import servico_banco
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
+from icc.relatorio import GraficosPDF, pdf_em_bytes, pdf_memorizado
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 path_colaborativo = Path("temas_sugeridos_colaborativos.json")
@@ -26,20 +27,7 @@ atividades_genericas = {
 
 criterios = list(atividades_genericas.keys())
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}[nota]
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
-class RelatorioICC(FPDF):
+class RelatorioICC(GraficosPDF, FPDF):
     def header(self):
         if os.path.exists(logo_path):
             self.image(logo_path, 10, 8, 30)
@@ -86,7 +74,7 @@ with st.form("formulario_icc"):
     calcular = st.form_submit_button("Calcular ICC")
 
 if calcular:
-    icc = sum(converter_nota(notas_usuario[c]) * pesos_usuario[c] for c in criterios) / sum(pesos_usuario.values())
+    icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
     st.session_state.icc_valor = icc
     st.session_state.notas = notas_usuario
     st.session_state.pesos = pesos_usuario
@@ -108,17 +96,6 @@ if st.session_state.icc_calculado:
     fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])), showlegend=False)
     st.plotly_chart(fig)
 
-    radar_vals = [converter_nota(st.session_state.notas[c]) for c in criterios] + [converter_nota(st.session_state.notas[criterios[0]])]
-    radar_labels = criterios + [criterios[0]]
-    fig2, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.plot(radar_vals, linewidth=1)
-    ax.fill(radar_vals, alpha=0.1)
-    ax.set_xticks([i * 2 * 3.14159 / len(radar_labels) for i in range(len(radar_labels))])
-    ax.set_xticklabels(radar_labels, fontsize=8)
-    radar_path = "/tmp/grafico_icc_persistente.png"
-    plt.savefig(radar_path)
-    plt.close()
-
     st.markdown("### Sugestões de Atividades Relacionadas à Temática da Pesquisa que possam contribuir com o ICC")
 
     for i, (criterio, atividade) in enumerate(atividades_genericas.items()):
@@ -131,14 +108,7 @@ if st.session_state.icc_calculado:
                 st.session_state.atividades_marcadas.remove(atividade)
 
     if st.button("Salvar atividades selecionadas", key="botao_salvar_atividades"):
-        if path_colaborativo.exists():
-            with open(path_colaborativo, "r", encoding="utf-8") as f:
-                base = json.load(f)
-        else:
-            base = {}
-        base[st.session_state.tema.lower()] = st.session_state.atividades_marcadas
-        with open(path_colaborativo, "w", encoding="utf-8") as f:
-            json.dump(base, f, indent=2, ensure_ascii=False)
+        servico_banco(path_colaborativo).salvar({st.session_state.tema.lower(): st.session_state.atividades_marcadas})
         st.success(f"As seguintes atividades foram salvas para a temática '{st.session_state.tema}':\n- " + "\n- ".join(st.session_state.atividades_marcadas))
 
     
@@ -147,36 +117,37 @@ if st.session_state.icc_calculado:
     novas_sugestoes = st.text_area("Digite outras atividades, separadas por linha", key="sugestoes_livres")
 
     if st.button("Salvar atividades selecionadas", key="botao_salvar_atividades"):
-        if path_colaborativo.exists():
-            with open(path_colaborativo, "r", encoding="utf-8") as f:
-                base = json.load(f)
-        else:
-            base = {}
-
         todas_atividades = st.session_state.atividades_marcadas.copy()
         if novas_sugestoes.strip():
             novas = [a.strip() for a in novas_sugestoes.strip().split("\n") if a.strip()]
             todas_atividades.extend(novas)
 
-        base[st.session_state.tema.lower()] = todas_atividades
-        with open(path_colaborativo, "w", encoding="utf-8") as f:
-            json.dump(base, f, indent=2, ensure_ascii=False)
+        servico_banco(path_colaborativo).salvar({st.session_state.tema.lower(): todas_atividades})
         st.success(f"As seguintes atividades foram salvas para a temática '{st.session_state.tema}':\n- " + "\n- ".join(todas_atividades))
     
-    pdf = RelatorioICC()
-    pdf.add_page()
-    pdf.chapter_title("Dados da Avaliação")
-    pdf.chapter_body(f"Nome: {st.session_state.nome}\nTemática: {st.session_state.tema}\nICC: {st.session_state.icc_valor:.3f}\n{interpretar_icc(st.session_state.icc_valor)}")
-    pdf.chapter_title("Notas e Pesos por Critério")
-    for c in criterios:
-        pdf.chapter_body(f"- {c}: Nota {st.session_state.notas[c]}, Peso {st.session_state.pesos[c]}")
-    pdf.chapter_title("Gráfico Radar")
-    pdf.image(radar_path, x=30, w=150)
-    if st.session_state.atividades_marcadas:
-        pdf.chapter_title("Atividades Curadas Selecionadas")
-        for a in st.session_state.atividades_marcadas:
-            pdf.chapter_body(f"- {a}")
-    pdf_path = "/tmp/relatorio_icc_persistente.pdf"
-    pdf.output(pdf_path)
-    with open(pdf_path, "rb") as f:
-        st.download_button("📥 Baixar Relatório PDF", f, file_name="relatorio_icc_persistente.pdf")
\ No newline at end of file
+    def gerar_pdf():
+        pdf = RelatorioICC()
+        pdf.add_page()
+        pdf.chapter_title("Dados da Avaliação")
+        pdf.chapter_body(f"Nome: {st.session_state.nome}\nTemática: {st.session_state.tema}\nICC: {st.session_state.icc_valor:.3f}\n{interpretar_icc(st.session_state.icc_valor)}")
+        pdf.chapter_title("Notas e Pesos por Critério")
+        for c in criterios:
+            pdf.chapter_body(f"- {c}: Nota {st.session_state.notas[c]}, Peso {st.session_state.pesos[c]}")
+        pdf.chapter_title("Gráfico Radar")
+        pdf.grafico_radar({c: converter_nota(st.session_state.notas[c]) for c in criterios}, criterios, x=30, w=150)
+        if st.session_state.atividades_marcadas:
+            pdf.chapter_title("Atividades Curadas Selecionadas")
+            for a in st.session_state.atividades_marcadas:
+                pdf.chapter_body(f"- {a}")
+        return pdf_em_bytes(pdf)
+
+    # O PDF só é montado quando pedido e fica guardado enquanto as entradas do relatório não mudam
+    entradas_pdf = (
+        st.session_state.nome, st.session_state.tema, st.session_state.icc_valor,
+        tuple(st.session_state.notas.items()), tuple(st.session_state.pesos.items()), tuple(st.session_state.atividades_marcadas)
+    )
+    relatorio_pdf = pdf_memorizado(st.session_state, entradas_pdf)
+    if relatorio_pdf is None and st.button("📄 Gerar relatório PDF", key="gerar_relatorio_pdf"):
+        relatorio_pdf = pdf_memorizado(st.session_state, entradas_pdf, gerar_pdf)
+    if relatorio_pdf is not None:
+        st.download_button("📥 Baixar Relatório PDF", relatorio_pdf, file_name="relatorio_icc_persistente.pdf", mime="application/pdf")
\ No newline at end of file
@@ -4,14 +4,20 @@ import plotly.graph_objects as go
 from fpdf import FPDF
 import matplotlib.pyplot as plt
 import os
-import json
 from pathlib import Path
+from icc.autocompletar import AutocompletarTemas, normalizar_termo
+from icc.banco import servico_banco
+from icc.cache import sugestoes_em_cache
+from icc.corretor import CorretorOrtografico
+from icc.indice_invertido import IndiceInvertido
+from icc.interface import confirmar_parecidas, salvar_atividades, secao_importacao
+from icc.pontuacao import calcular_icc, interpretar_icc
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 path_colaborativo = Path("temas_sugeridos_colaborativos.json")
 
 # Banco semântico inicial
-banco_semantico = {
+banco_inicial = {
     "educação antirracista": {
         "keywords": ["racismo", "etnia", "afro", "discriminação", "negritude"],
         "atividades": [
@@ -39,37 +45,23 @@ banco_semantico = {
     # Outros temas podem ser adicionados aqui seguindo o modelo
 }
 
-# Carregar banco salvo
-if path_colaborativo.exists():
-    with open(path_colaborativo, "r", encoding="utf-8") as f:
-        banco_salvo = json.load(f)
-    banco_semantico.update(banco_salvo)
+# Banco compartilhado pelo processo: só é relido do disco quando o arquivo muda
+servico = servico_banco(path_colaborativo, banco_inicial)
+banco_semantico = servico.obter()
+indice_semantico = banco_semantico.derivado("indice_invertido", IndiceInvertido)
+corretor_temas = banco_semantico.derivado("corretor", CorretorOrtografico)
+autocompletar_temas = banco_semantico.derivado("autocompletar", AutocompletarTemas)
 
-def salvar_banco():
-    with open(path_colaborativo, "w", encoding="utf-8") as f:
-        json.dump(banco_semantico, f, indent=2, ensure_ascii=False)
+def salvar_banco(alteracoes):
+    servico.salvar(alteracoes)
 
 def encontrar_atividades(tema_digitado):
-    tema_digitado = tema_digitado.lower()
-    atividades = []
-    for tema, dados in banco_semantico.items():
-        if any(palavra in tema_digitado for palavra in dados["keywords"]) or tema in tema_digitado:
-            atividades.extend(dados["atividades"])
-    return atividades
-
-# Funções auxiliares
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}[nota]
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
+    atividades = sugestoes_em_cache(
+        path_colaborativo, "encontrar_atividades", tema_digitado,
+        lambda tema: tuple(indice_semantico.encontrar_atividades(corretor_temas.corrigir(tema))),
+        banco_semantico.versao
+    )
+    return list(atividades)
 
 # Menu inicial
 st.title("Índice de Contribuição Cidadã (ICC)")
@@ -85,6 +77,9 @@ if opcao == "Preencher ICC":
 
     nome = st.text_input("Seu nome:")
     tema = st.text_input("Temática da pesquisa:")
+    completacoes = autocompletar_temas.completar(tema)
+    if completacoes and normalizar_termo(tema) not in completacoes:
+        tema = st.selectbox("Completar com uma temática ou palavra-chave do banco:", [tema, *completacoes])
 
     pesos_usuario = {}
     notas_usuario = {}
@@ -115,12 +110,13 @@ if opcao == "Preencher ICC":
         calcular = st.form_submit_button("Calcular ICC")
 
     if calcular:
-        icc = sum(converter_nota(notas_usuario[c]) * pesos_usuario[c] for c in criterios) / sum(pesos_usuario.values())
+        icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
         st.session_state.icc_valor = icc
         st.session_state.notas = notas_usuario
         st.session_state.pesos = pesos_usuario
         st.session_state.nome = nome
         st.session_state.tema = tema
+        autocompletar_temas.registrar_uso(tema)
         st.session_state.icc_calculado = True
 
     if st.session_state.icc_calculado:
@@ -130,6 +126,7 @@ if opcao == "Preencher ICC":
         atividades_sugeridas = encontrar_atividades(st.session_state.tema)
 
         st.subheader("✅ Sugestões de Atividades Relacionadas")
+        st.caption(f"Revisão {banco_semantico.revisao} do banco semântico")
         if atividades_sugeridas:
             for atividade in atividades_sugeridas:
                 if st.checkbox(atividade, key=f"sugerida_{atividade}"):
@@ -149,16 +146,10 @@ if opcao == "Preencher ICC":
                 novas = [a.strip() for a in novas_sugestoes.strip().split("\n") if a.strip()]
                 todas_atividades.extend(novas)
 
-            if st.session_state.tema.lower() not in banco_semantico:
-                banco_semantico[st.session_state.tema.lower()] = {
-                    "keywords": [],
-                    "atividades": todas_atividades
-                }
-            else:
-                banco_semantico[st.session_state.tema.lower()]["atividades"].extend(todas_atividades)
-
-            salvar_banco()
+            tema_key = st.session_state.tema.lower()
+            salvar_atividades(servico, tema_key, todas_atividades)
             st.success(f"Atividades salvas para a temática '{st.session_state.tema}'.")
+        confirmar_parecidas(servico)
 
 else:
     st.subheader("🛠 Alimentar Banco de Temáticas e Atividades")
@@ -171,9 +162,10 @@ else:
         if nova_tematica and novas_palavras and novas_atividades:
             palavras = [p.strip().lower() for p in novas_palavras.split(",") if p.strip()]
             atividades = [a.strip() for a in novas_atividades.strip().split("\n") if a.strip()]
-            banco_semantico[nova_tematica.lower()] = {
+            salvar_banco({nova_tematica.lower(): {
                 "keywords": palavras,
                 "atividades": atividades
-            }
-            salvar_banco()
-            st.success(f"Nova temática '{nova_tematica}' adicionada com sucesso!")
\ No newline at end of file
+            }})
+            st.success(f"Nova temática '{nova_tematica}' adicionada com sucesso!")
+
+    secao_importacao(servico)
@@ -1,17 +1,23 @@
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
 from fpdf import FPDF
-import matplotlib.pyplot as plt
 import os
-import json
 from pathlib import Path
+from icc.autocompletar import AutocompletarTemas, normalizar_termo
+from icc.banco import servico_banco
+from icc.cache import sugestoes_em_cache
+from icc.corretor import CorretorOrtografico
+from icc.indice_invertido import IndiceInvertido
+from icc.interface import confirmar_parecidas, grade_edicao, listagem_paginada, salvar_atividades, secao_importacao
+from icc.listagem import ListagemBanco
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
+from icc.relatorio import GraficosPDF, pdf_em_bytes, pdf_memorizado
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 path_colaborativo = Path("temas_sugeridos_colaborativos.json")
 
 # Banco semântico inicial
-banco_semantico = {
+banco_inicial = {
     "educação antirracista": {
         "keywords": ["racismo", "etnia", "afro", "discriminação", "negritude"],
         "atividades": [
@@ -38,38 +44,26 @@ banco_semantico = {
     },
 }
 
-# Carregar banco salvo
-if path_colaborativo.exists():
-    with open(path_colaborativo, "r", encoding="utf-8") as f:
-        banco_salvo = json.load(f)
-    banco_semantico.update(banco_salvo)
+# Banco compartilhado pelo processo: só é relido do disco quando o arquivo muda
+servico = servico_banco(path_colaborativo, banco_inicial)
+banco_semantico = servico.obter()
+indice_semantico = banco_semantico.derivado("indice_invertido", IndiceInvertido)
+corretor_temas = banco_semantico.derivado("corretor", CorretorOrtografico)
+autocompletar_temas = banco_semantico.derivado("autocompletar", AutocompletarTemas)
+listagem_banco = banco_semantico.derivado("listagem", ListagemBanco)
 
-def salvar_banco():
-    with open(path_colaborativo, "w", encoding="utf-8") as f:
-        json.dump(banco_semantico, f, indent=2, ensure_ascii=False)
+def salvar_banco(alteracoes):
+    servico.salvar(alteracoes)
 
 def encontrar_atividades(tema_digitado):
-    tema_digitado = tema_digitado.lower()
-    atividades = []
-    for tema, dados in banco_semantico.items():
-        if any(palavra in tema_digitado for palavra in dados["keywords"]) or tema in tema_digitado:
-            atividades.extend(dados["atividades"])
-    return atividades
-
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}[nota]
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
-class RelatorioICC(FPDF):
+    atividades = sugestoes_em_cache(
+        path_colaborativo, "encontrar_atividades", tema_digitado,
+        lambda tema: tuple(indice_semantico.encontrar_atividades(corretor_temas.corrigir(tema))),
+        banco_semantico.versao
+    )
+    return list(atividades)
+
+class RelatorioICC(GraficosPDF, FPDF):
     def header(self):
         if os.path.exists(logo_path):
             self.image(logo_path, 10, 8, 30)
@@ -104,6 +98,9 @@ if opcao == "Preencher ICC":
 
     nome = st.text_input("Seu nome:")
     tema = st.text_input("Temática da pesquisa:")
+    completacoes = autocompletar_temas.completar(tema)
+    if completacoes and normalizar_termo(tema) not in completacoes:
+        tema = st.selectbox("Completar com uma temática ou palavra-chave do banco:", [tema, *completacoes])
 
     pesos_usuario = {}
     notas_usuario = {}
@@ -134,12 +131,13 @@ if opcao == "Preencher ICC":
         calcular = st.form_submit_button("Calcular ICC")
 
     if calcular:
-        icc = sum(converter_nota(notas_usuario[c]) * pesos_usuario[c] for c in criterios) / sum(pesos_usuario.values())
+        icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
         st.session_state.icc_valor = icc
         st.session_state.notas = notas_usuario
         st.session_state.pesos = pesos_usuario
         st.session_state.nome = nome
         st.session_state.tema = tema
+        autocompletar_temas.registrar_uso(tema)
         st.session_state.icc_calculado = True
 
     if st.session_state.icc_calculado:
@@ -156,20 +154,10 @@ if opcao == "Preencher ICC":
         fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])), showlegend=False)
         st.plotly_chart(fig)
 
-        radar_vals = [converter_nota(st.session_state.notas[c]) for c in criterios] + [converter_nota(st.session_state.notas[criterios[0]])]
-        radar_labels = criterios + [criterios[0]]
-        fig2, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-        ax.plot(radar_vals, linewidth=1)
-        ax.fill(radar_vals, alpha=0.1)
-        ax.set_xticks([i * 2 * 3.14159 / len(radar_labels) for i in range(len(radar_labels))])
-        ax.set_xticklabels(radar_labels, fontsize=8)
-        radar_path = "/tmp/grafico_icc_inteligente.png"
-        plt.savefig(radar_path)
-        plt.close()
-
         atividades_sugeridas = encontrar_atividades(st.session_state.tema)
 
         st.subheader("✅ Sugestões de Atividades Relacionadas")
+        st.caption(f"Revisão {banco_semantico.revisao} do banco semântico")
         if atividades_sugeridas:
             for atividade in atividades_sugeridas:
                 if st.checkbox(atividade, key=f"sugerida_{atividade}"):
@@ -189,34 +177,42 @@ if opcao == "Preencher ICC":
                 novas = [a.strip() for a in novas_sugestoes.strip().split("\n") if a.strip()]
                 todas_atividades.extend(novas)
 
-            if st.session_state.tema.lower() not in banco_semantico:
-                banco_semantico[st.session_state.tema.lower()] = {
-                    "keywords": [],
-                    "atividades": todas_atividades
-                }
-            else:
-                banco_semantico[st.session_state.tema.lower()]["atividades"].extend(todas_atividades)
-
-            salvar_banco()
+            tema_key = st.session_state.tema.lower()
+            salvar_atividades(servico, tema_key, todas_atividades)
             st.success(f"Atividades salvas para a temática '{st.session_state.tema}'.")
-
-        pdf = RelatorioICC()
-        pdf.add_page()
-        pdf.chapter_title("Dados da Avaliação")
-        pdf.chapter_body(f"Nome: {st.session_state.nome}\nTemática: {st.session_state.tema}\nICC: {st.session_state.icc_valor:.3f}\n{interpretar_icc(st.session_state.icc_valor)}")
-        pdf.chapter_title("Notas e Pesos por Critério")
-        for c in criterios:
-            pdf.chapter_body(f"- {c}: Nota {st.session_state.notas[c]}, Peso {st.session_state.pesos[c]}")
-        pdf.chapter_title("Gráfico Radar")
-        pdf.image(radar_path, x=30, w=150)
-        if todas_atividades:
-            pdf.chapter_title("Atividades Curadas e Sugeridas")
-            for a in todas_atividades:
-                pdf.chapter_body(f"- {a}")
-        pdf_path = "/tmp/relatorio_icc_final.pdf"
-        pdf.output(pdf_path)
-        with open(pdf_path, "rb") as f:
-            st.download_button("📥 Baixar Relatório PDF", f, file_name="relatorio_icc_final.pdf")
+        confirmar_parecidas(servico)
+
+        todas_atividades = st.session_state.atividades_marcadas.copy()
+        if novas_sugestoes.strip():
+            novas = [a.strip() for a in novas_sugestoes.strip().split("\n") if a.strip()]
+            todas_atividades.extend(novas)
+
+        def gerar_pdf():
+            pdf = RelatorioICC()
+            pdf.add_page()
+            pdf.chapter_title("Dados da Avaliação")
+            pdf.chapter_body(f"Nome: {st.session_state.nome}\nTemática: {st.session_state.tema}\nICC: {st.session_state.icc_valor:.3f}\n{interpretar_icc(st.session_state.icc_valor)}")
+            pdf.chapter_title("Notas e Pesos por Critério")
+            for c in criterios:
+                pdf.chapter_body(f"- {c}: Nota {st.session_state.notas[c]}, Peso {st.session_state.pesos[c]}")
+            pdf.chapter_title("Gráfico Radar")
+            pdf.grafico_radar({c: converter_nota(st.session_state.notas[c]) for c in criterios}, criterios, x=30, w=150)
+            if todas_atividades:
+                pdf.chapter_title("Atividades Curadas e Sugeridas")
+                for a in todas_atividades:
+                    pdf.chapter_body(f"- {a}")
+            return pdf_em_bytes(pdf)
+
+        # O PDF só é montado quando pedido e fica guardado enquanto as entradas do relatório não mudam
+        entradas_pdf = (
+            st.session_state.nome, st.session_state.tema, st.session_state.icc_valor,
+            tuple(st.session_state.notas.items()), tuple(st.session_state.pesos.items()), tuple(todas_atividades)
+        )
+        relatorio_pdf = pdf_memorizado(st.session_state, entradas_pdf)
+        if relatorio_pdf is None and st.button("📄 Gerar relatório PDF", key="gerar_relatorio_pdf"):
+            relatorio_pdf = pdf_memorizado(st.session_state, entradas_pdf, gerar_pdf)
+        if relatorio_pdf is not None:
+            st.download_button("📥 Baixar Relatório PDF", relatorio_pdf, file_name="relatorio_icc_final.pdf", mime="application/pdf")
 
 else:
     st.subheader("🛠 Alimentar Banco de Temáticas e Atividades")
@@ -229,20 +225,14 @@ else:
         if nova_tematica and novas_palavras and novas_atividades:
             palavras = [p.strip().lower() for p in novas_palavras.split(",") if p.strip()]
             atividades = [a.strip() for a in novas_atividades.strip().split("\n") if a.strip()]
-            banco_semantico[nova_tematica.lower()] = {
+            salvar_banco({nova_tematica.lower(): {
                 "keywords": palavras,
                 "atividades": atividades
-            }
-            salvar_banco()
+            }})
             st.success(f"Nova temática '{nova_tematica}' adicionada com sucesso!")
 
-    if st.button("📋 Ver Banco de Temáticas Existentes", key="listar_banco_existente"):
-        dados = []
-        for tema, conteudo in banco_semantico.items():
-            dados.append({
-                "Temática": tema.title(),
-                "Palavras-chave": ", ".join(conteudo.get("keywords", [])),
-                "Atividades": "; ".join(conteudo.get("atividades", []))
-            })
-        df_banco = pd.DataFrame(dados)
-        st.dataframe(df_banco)
\ No newline at end of file
+    secao_importacao(servico)
+
+    with st.expander("📋 Ver Banco de Temáticas Existentes"):
+        temas_pagina, chave_edicao = listagem_paginada(listagem_banco)
+        grade_edicao(servico, banco_semantico, temas_pagina, chave_edicao)
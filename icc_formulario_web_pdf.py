@@ -1,6 +1,8 @@
 import streamlit as st
 import plotly.graph_objects as go
 from fpdf import FPDF
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
+from icc.relatorio import pdf_em_bytes
 
 # Título
 st.title("Índice de Contribuição Cidadã (ICC)")
@@ -20,19 +22,6 @@ criterios_pesos = {
     "Cidadania digital": 0.6
 }
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}.get(nota, 0)
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
 notas_usuario = {}
 with st.form("form_icc"):
     for criterio in criterios_pesos:
@@ -44,17 +33,8 @@ with st.form("form_icc"):
     submitted = st.form_submit_button("Calcular ICC")
 
 if submitted:
-    numerador = 0
-    denominador = 0
-    notas_convertidas = {}
-
-    for criterio, peso in criterios_pesos.items():
-        nota_convertida = converter_nota(notas_usuario[criterio])
-        notas_convertidas[criterio] = nota_convertida
-        numerador += nota_convertida * peso
-        denominador += peso
-
-    icc = numerador / denominador
+    notas_convertidas = {c: converter_nota(notas_usuario[c]) for c in criterios_pesos}
+    icc = calcular_icc(notas_usuario, criterios_pesos)
     interpretacao = interpretar_icc(icc)
 
     st.success(f"Índice de Contribuição Cidadã (ICC): {icc:.3f}")
@@ -89,7 +69,4 @@ if submitted:
         pdf.set_font("Arial", size=11)
         for crit, nota in notas_usuario.items():
             pdf.cell(200, 8, f"- {crit}: Nota {nota}", ln=True)
-        pdf_output_path = "/tmp/icc_relatorio.pdf"
-        pdf.output(pdf_output_path)
-        with open(pdf_output_path, "rb") as f:
-            st.download_button("📥 Baixar PDF", f, file_name="relatorio_icc.pdf")
\ No newline at end of file
+        st.download_button("📥 Baixar PDF", pdf_em_bytes(pdf), file_name="relatorio_icc.pdf", mime="application/pdf")
\ No newline at end of file
@@ -2,7 +2,8 @@ import streamlit as st
 import plotly.graph_objects as go
 from fpdf import FPDF
 import os
-import matplotlib.pyplot as plt
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
+from icc.relatorio import GraficosPDF, pdf_em_bytes
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 
@@ -40,20 +41,7 @@ atividades_recomendadas = {
     ]
 }
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}.get(nota, 0)
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
-class RelatorioICC(FPDF):
+class RelatorioICC(GraficosPDF, FPDF):
     def header(self):
         if os.path.exists(logo_path):
             self.image(logo_path, 10, 8, 30)
@@ -85,17 +73,8 @@ with st.form("form_icc"):
     submitted = st.form_submit_button("Calcular ICC")
 
 if submitted and nome and tema:
-    numerador = 0
-    denominador = 0
-    notas_convertidas = {}
-
-    for criterio, peso in criterios_pesos.items():
-        nota_convertida = converter_nota(notas_usuario[criterio])
-        notas_convertidas[criterio] = nota_convertida
-        numerador += nota_convertida * peso
-        denominador += peso
-
-    icc = numerador / denominador
+    notas_convertidas = {c: converter_nota(notas_usuario[c]) for c in criterios_pesos}
+    icc = calcular_icc(notas_usuario, criterios_pesos)
     interpretacao = interpretar_icc(icc)
 
     st.success(f"ICC de {nome} sobre '{tema}': {icc:.3f}")
@@ -113,20 +92,7 @@ if submitted and nome and tema:
     fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])), showlegend=False, height=600)
     st.plotly_chart(fig, use_container_width=True)
 
-    # Criar imagem do gráfico radar para incluir no PDF
-    radar_labels = list(notas_convertidas.keys())
-    radar_vals = list(notas_convertidas.values())
-    radar_vals.append(radar_vals[0])
-    radar_labels.append(radar_labels[0])
-    fig2, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.plot(radar_vals, linewidth=1, linestyle='solid')
-    ax.fill(radar_vals, 'b', alpha=0.1)
-    ax.set_xticks([i * 2 * 3.14159 / len(radar_labels) for i in range(len(radar_labels))])
-    ax.set_xticklabels(radar_labels, fontsize=8)
-    radar_path = "/tmp/grafico_icc_radar.png"
-    plt.savefig(radar_path)
-    plt.close()
-
+    # Gerar PDF
     pdf = RelatorioICC()
     pdf.add_page()
     pdf.chapter_title("Dados da Avaliação")
@@ -136,14 +102,11 @@ if submitted and nome and tema:
     for crit, nota in notas_usuario.items():
         pdf.chapter_body(f"- {crit}: Nota {nota}")
     pdf.chapter_title("Gráfico de Desempenho")
-    pdf.image(radar_path, x=30, w=150)
+    pdf.grafico_radar(notas_convertidas, list(notas_convertidas), x=30, w=150)
     pdf.chapter_title("Sugestões para Melhoria")
     for crit, val in notas_convertidas.items():
         if val < 1.0 and crit in atividades_recomendadas:
             pdf.chapter_body(f"{crit}:")
             for atividade in atividades_recomendadas[crit]:
                 pdf.chapter_body(f"  - {atividade}")
-    pdf_path = "/tmp/relatorio_icc_unicarioca_final.pdf"
-    pdf.output(pdf_path)
-    with open(pdf_path, "rb") as f:
-        st.download_button("📥 Baixar Relatório PDF Completo", f, file_name="relatorio_icc_unicarioca_final.pdf")
\ No newline at end of file
+    st.download_button("📥 Baixar Relatório PDF Completo", pdf_em_bytes(pdf), file_name="relatorio_icc_unicarioca_final.pdf", mime="application/pdf")
\ No newline at end of file
@@ -2,6 +2,8 @@ import streamlit as st
 import plotly.graph_objects as go
 from fpdf import FPDF
 import os
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
+from icc.relatorio import pdf_em_bytes
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 
@@ -22,19 +24,6 @@ criterios_pesos = {
     "Cidadania digital": 0.6
 }
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}.get(nota, 0)
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
 class RelatorioICC(FPDF):
     def header(self):
         if os.path.exists(logo_path):
@@ -67,17 +56,8 @@ with st.form("form_icc"):
     submitted = st.form_submit_button("Calcular ICC")
 
 if submitted:
-    numerador = 0
-    denominador = 0
-    notas_convertidas = {}
-
-    for criterio, peso in criterios_pesos.items():
-        nota_convertida = converter_nota(notas_usuario[criterio])
-        notas_convertidas[criterio] = nota_convertida
-        numerador += nota_convertida * peso
-        denominador += peso
-
-    icc = numerador / denominador
+    notas_convertidas = {c: converter_nota(notas_usuario[c]) for c in criterios_pesos}
+    icc = calcular_icc(notas_usuario, criterios_pesos)
     interpretacao = interpretar_icc(icc)
 
     st.success(f"Índice de Contribuição Cidadã (ICC): {icc:.3f}")
@@ -104,7 +84,4 @@ if submitted:
     pdf.chapter_title("Notas por Critério:")
     for crit, nota in notas_usuario.items():
         pdf.chapter_body(f"- {crit}: Nota {nota}")
-    pdf_output_path = "/tmp/icc_relatorio_unicarioca.pdf"
-    pdf.output(pdf_output_path)
-    with open(pdf_output_path, "rb") as f:
-        st.download_button("📥 Baixar Relatório PDF", f, file_name="relatorio_icc_unicarioca.pdf")
\ No newline at end of file
+    st.download_button("📥 Baixar Relatório PDF", pdf_em_bytes(pdf), file_name="relatorio_icc_unicarioca.pdf", mime="application/pdf")
\ No newline at end of file
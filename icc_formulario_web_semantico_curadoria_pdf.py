@@ -2,10 +2,11 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from fpdf import FPDF
-import matplotlib.pyplot as plt
 import os
-import json
 from pathlib import Path
+from icc.banco import servico_banco
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
+from icc.relatorio import GraficosPDF, pdf_em_bytes
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 path_colaborativo = Path("temas_sugeridos_colaborativos.json")
@@ -41,20 +42,7 @@ atividades_genericas = {
 
 criterios = list(atividades_genericas.keys())
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}[nota]
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
-class RelatorioICC(FPDF):
+class RelatorioICC(GraficosPDF, FPDF):
     def header(self):
         if os.path.exists(logo_path):
             self.image(logo_path, 10, 8, 30)
@@ -95,7 +83,7 @@ with st.form("icc_form"):
     submit = st.form_submit_button("Calcular ICC")
 
 if submit and nome and tema:
-    icc = sum(converter_nota(notas_usuario[c]) * pesos_usuario[c] for c in criterios) / sum(pesos_usuario.values())
+    icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
     st.success(f"ICC: {icc:.3f}")
     st.info(interpretar_icc(icc))
 
@@ -109,17 +97,6 @@ if submit and nome and tema:
     fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])), showlegend=False)
     st.plotly_chart(fig)
 
-    radar_vals = [converter_nota(notas_usuario[c]) for c in criterios] + [converter_nota(notas_usuario[criterios[0]])]
-    radar_labels = criterios + [criterios[0]]
-    fig2, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.plot(radar_vals, linewidth=1)
-    ax.fill(radar_vals, alpha=0.1)
-    ax.set_xticks([i * 2 * 3.14159 / len(radar_labels) for i in range(len(radar_labels))])
-    ax.set_xticklabels(radar_labels, fontsize=8)
-    radar_path = "/tmp/grafico_icc_hibrido.png"
-    plt.savefig(radar_path)
-    plt.close()
-
     # Associação semântica
     atividades_semanticas = []
     for tema_ref, dados in tematicas_semantico.items():
@@ -136,14 +113,7 @@ if submit and nome and tema:
         st.markdown("### Sugestões de Atividades por Curadoria (marque as relevantes)")
         atividades_curadas = st.multiselect("Atividades possíveis:", list(atividades_genericas.values()))
         if atividades_curadas and st.button("Salvar nova temática e atividades marcadas"):
-            if path_colaborativo.exists():
-                with open(path_colaborativo, "r", encoding="utf-8") as f:
-                    base = json.load(f)
-            else:
-                base = {}
-            base[tema.lower()] = atividades_curadas
-            with open(path_colaborativo, "w", encoding="utf-8") as f:
-                json.dump(base, f, indent=2, ensure_ascii=False)
+            servico_banco(path_colaborativo).salvar({tema.lower(): atividades_curadas})
             st.success("Nova temática registrada com sucesso!")
 
     # PDF
@@ -155,7 +125,7 @@ if submit and nome and tema:
     for c in criterios:
         pdf.chapter_body(f"- {c}: Nota {notas_usuario[c]}, Peso {pesos_usuario[c]}")
     pdf.chapter_title("Gráfico Radar")
-    pdf.image(radar_path, x=30, w=150)
+    pdf.grafico_radar({c: converter_nota(notas_usuario[c]) for c in criterios}, criterios, x=30, w=150)
     if atividades_semanticas:
         pdf.chapter_title("Sugestões Semânticas")
         for a in atividades_semanticas:
@@ -164,7 +134,4 @@ if submit and nome and tema:
         pdf.chapter_title("Sugestões Curadas")
         for a in atividades_curadas:
             pdf.chapter_body(f"- {a}")
-    pdf_path = "/tmp/relatorio_icc_hibrido.pdf"
-    pdf.output(pdf_path)
-    with open(pdf_path, "rb") as f:
-        st.download_button("📥 Baixar Relatório PDF", f, file_name="relatorio_icc_hibrido.pdf")
\ No newline at end of file
+    st.download_button("📥 Baixar Relatório PDF", pdf_em_bytes(pdf), file_name="relatorio_icc_hibrido.pdf", mime="application/pdf")
\ No newline at end of file
@@ -3,7 +3,9 @@ import pandas as pd
 import plotly.graph_objects as go
 from fpdf import FPDF
 import os
-import matplotlib.pyplot as plt
+from icc.indice_trigramas import IndiceTrigramas
+from icc.pontuacao import calcular_icc, converter_nota, interpretar_icc
+from icc.relatorio import GraficosPDF, pdf_em_bytes
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 
@@ -41,20 +43,7 @@ with st.form("form_avaliacao"):
             notas_usuario[crit] = st.selectbox("Nota", options=[4, 3, 2, 1], key=f"nota_{crit}")
     submitted = st.form_submit_button("Calcular ICC")
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}.get(nota, 0)
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
-class RelatorioICC(FPDF):
+class RelatorioICC(GraficosPDF, FPDF):
     def header(self):
         if os.path.exists(logo_path):
             self.image(logo_path, 10, 8, 30)
@@ -79,7 +68,6 @@ class RelatorioICC(FPDF):
 if submitted and nome and tema:
     st.markdown("### Sugestões de Atividades Relacionadas à Temática da Pesquisa que possam contribuir com o ICC")
 
-    from difflib import get_close_matches
     tematicas_atividades = {
         "educação sexual": [
             "Rodas de conversa sobre identidade de gênero e sexualidade",
@@ -118,12 +106,14 @@ if submitted and nome and tema:
         ]
     }
 
+    indice_tematicas = IndiceTrigramas(tematicas_atividades)
+
     def analisar_sugestoes_tema_livre(texto_usuario, base, cutoff=0.3):
         texto = texto_usuario.lower()
         palavras_tema = texto.split()
         matches = set()
         for palavra in palavras_tema:
-            aproximados = get_close_matches(palavra, base.keys(), n=2, cutoff=cutoff)
+            aproximados = indice_tematicas.aproximados(palavra, n=2, cutoff=cutoff)
             matches.update(aproximados)
         resultados = []
         for tema in matches:
@@ -171,18 +161,8 @@ if submitted and nome and tema:
     else:
         st.warning("Nenhuma sugestão automática foi encontrada com base na temática digitada.")
 
-    numerador = 0
-    denominador = 0
-    notas_convertidas = {}
-
-    for criterio in criterios:
-        nota_convertida = converter_nota(notas_usuario[criterio])
-        peso = pesos_usuario[criterio]
-        notas_convertidas[criterio] = nota_convertida
-        numerador += nota_convertida * peso
-        denominador += peso
-
-    icc = numerador / denominador
+    notas_convertidas = {c: converter_nota(notas_usuario[c]) for c in criterios}
+    icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
     interpretacao = interpretar_icc(icc)
 
     st.success(f"ICC de {nome} sobre '{tema}': {icc:.3f}")
@@ -209,18 +189,7 @@ if submitted and nome and tema:
     fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])), showlegend=False, height=600)
     st.plotly_chart(fig, use_container_width=True)
 
-    # Gráfico para PDF
-    radar_vals = list(notas_convertidas.values()) + [list(notas_convertidas.values())[0]]
-    radar_labels = criterios + [criterios[0]]
-    fig2, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.plot(radar_vals, linewidth=1, linestyle='solid')
-    ax.fill(radar_vals, 'b', alpha=0.1)
-    ax.set_xticks([i * 2 * 3.14159 / len(radar_labels) for i in range(len(radar_labels))])
-    ax.set_xticklabels(radar_labels, fontsize=8)
-    radar_path = "/tmp/icc_grafico_radar_tabela.png"
-    plt.savefig(radar_path)
-    plt.close()
-
+    # Gerar PDF
     pdf = RelatorioICC()
     pdf.add_page()
     pdf.chapter_title("Dados da Avaliação")
@@ -230,7 +199,7 @@ if submitted and nome and tema:
     for crit in criterios:
         pdf.chapter_body(f"- {crit}: Nota {notas_usuario[crit]}, Peso {pesos_usuario[crit]}")
     pdf.chapter_title("Gráfico de Desempenho")
-    pdf.image(radar_path, x=30, w=150)
+    pdf.grafico_radar(notas_convertidas, list(notas_convertidas), x=30, w=150)
     
     pdf.chapter_title("Sugestões de Atividades por Temática Aproximada")
     if sugestoes_rankeadas:
@@ -238,8 +207,4 @@ if submitted and nome and tema:
             pdf.chapter_body(f"{tema} - {atividade} (Impacto estimado: {impacto})")
     else:
         pdf.chapter_body("Nenhuma sugestão automática foi encontrada com base na temática digitada.")
-    pdf_path = "/tmp/relatorio_icc_tabela.pdf"
-    
-    pdf.output(pdf_path)
-    with open(pdf_path, "rb") as f:
-        st.download_button("📥 Baixar Relatório PDF com Avaliação", f, file_name="relatorio_icc_tabela.pdf")
\ No newline at end of file
+    st.download_button("📥 Baixar Relatório PDF com Avaliação", pdf_em_bytes(pdf), file_name="relatorio_icc_tabela.pdf", mime="application/pdf")
\ No newline at end of file
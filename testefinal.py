@@ -1,17 +1,20 @@
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
 from fpdf import FPDF
-import matplotlib.pyplot as plt
 import os
-import json
 from pathlib import Path
+from icc.autocompletar import AutocompletarTemas, normalizar_termo
+from icc.banco import servico_banco
+from icc.interface import grade_edicao, listagem_paginada, secao_importacao
+from icc.listagem import ListagemBanco
+from icc.pontuacao import calcular_icc, interpretar_icc
+from icc.relatorio import pdf_em_bytes
 
 logo_path = "c84616cb-25bb-448d-9739-31c9e21c4178.png"
 path_colaborativo = Path("temas_sugeridos_colaborativos.json")
 
 # Banco inicial simplificado
-banco_semantico = {
+banco_inicial = {
     "educação antirracista": {
         "keywords": ["racismo", "etnia", "afro", "discriminação", "negritude"],
         "atividades": [
@@ -22,15 +25,14 @@ banco_semantico = {
     }
 }
 
-# Carregar banco salvo se existir
-if path_colaborativo.exists():
-    with open(path_colaborativo, "r", encoding="utf-8") as f:
-        banco_salvo = json.load(f)
-    banco_semantico.update(banco_salvo)
+# Banco compartilhado pelo processo: só é relido do disco quando o arquivo muda
+servico = servico_banco(path_colaborativo, banco_inicial)
+banco_semantico = servico.obter()
+autocompletar_temas = banco_semantico.derivado("autocompletar", AutocompletarTemas)
+listagem_banco = banco_semantico.derivado("listagem", ListagemBanco)
 
-def salvar_banco():
-    with open(path_colaborativo, "w", encoding="utf-8") as f:
-        json.dump(banco_semantico, f, indent=2, ensure_ascii=False)
+def salvar_banco(alteracoes):
+    servico.salvar(alteracoes)
 
 def encontrar_atividades(tema_digitado):
     tema_digitado = tema_digitado.lower()
@@ -40,19 +42,6 @@ def encontrar_atividades(tema_digitado):
             atividades.extend(dados["atividades"])
     return atividades
 
-def converter_nota(nota):
-    return {4: 1.0, 3: 0.75, 2: 0.5, 1: 0.25}[nota]
-
-def interpretar_icc(valor):
-    if valor >= 0.85:
-        return "Excelente contribuição para a formação cidadã e a diversidade social."
-    elif valor >= 0.7:
-        return "Boa contribuição, com potencial de fortalecimento em alguns critérios."
-    elif valor >= 0.5:
-        return "Contribuição regular, recomenda-se revisão e reforço em múltiplas dimensões."
-    else:
-        return "Baixa contribuição; é necessário reestruturar a proposta para ampliar o impacto cidadão."
-
 class RelatorioICC(FPDF):
     def header(self):
         if os.path.exists(logo_path):
@@ -79,6 +68,9 @@ opcao = st.radio("Escolha uma opção:", ["Preencher ICC", "Alimentar Banco de T
 if opcao == "Preencher ICC":
     nome = st.text_input("Seu nome:")
     tema = st.text_input("Temática da pesquisa:")
+    completacoes = autocompletar_temas.completar(tema)
+    if completacoes and normalizar_termo(tema) not in completacoes:
+        tema = st.selectbox("Completar com uma temática ou palavra-chave do banco:", [tema, *completacoes])
 
     pesos_usuario = {}
     notas_usuario = {}
@@ -109,11 +101,12 @@ if opcao == "Preencher ICC":
         calcular = st.form_submit_button("Calcular ICC")
 
     if calcular:
-        icc = sum(converter_nota(notas_usuario[c]) * pesos_usuario[c] for c in criterios) / sum(pesos_usuario.values())
+        icc = calcular_icc(notas_usuario, pesos_usuario, criterios)
         st.success(f"ICC: {icc:.3f}")
         st.info(interpretar_icc(icc))
 
         st.subheader("Sugestões de Atividades Relacionadas")
+        st.caption(f"Revisão {banco_semantico.revisao} do banco semântico")
         atividades_sugeridas = encontrar_atividades(tema)
         atividades_marcadas = []
 
@@ -139,11 +132,7 @@ if opcao == "Preencher ICC":
         for atividade in todas_atividades:
             pdf.chapter_body(f"- {atividade}")
 
-        pdf_path = "/tmp/relatorio_icc_finalizado.pdf"
-        pdf.output(pdf_path)
-
-        with open(pdf_path, "rb") as f:
-            st.download_button("📥 Baixar Relatório PDF", f, file_name="relatorio_icc_finalizado.pdf")
+        st.download_button("📥 Baixar Relatório PDF", pdf_em_bytes(pdf), file_name="relatorio_icc_finalizado.pdf", mime="application/pdf")
 
 elif opcao == "Alimentar Banco de Temáticas":
     nova_tematica = st.text_input("Nova temática:")
@@ -153,19 +142,14 @@ elif opcao == "Alimentar Banco de Temáticas":
     if st.button("Adicionar ao Banco"):
         palavras = [p.strip() for p in novas_palavras.split(",") if p.strip()]
         atividades = [a.strip() for a in novas_atividades.split("\n") if a.strip()]
-        banco_semantico[nova_tematica.lower()] = {
+        salvar_banco({nova_tematica.lower(): {
             "keywords": palavras,
             "atividades": atividades
-        }
-        salvar_banco()
+        }})
         st.success("Nova temática adicionada com sucesso!")
 
-    if st.button("📋 Ver Banco Atual"):
-        dados = []
-        for tema, conteudo in banco_semantico.items():
-            dados.append({
-                "Temática": tema.title(),
-                "Palavras-chave": ", ".join(conteudo["keywords"]),
-                "Atividades": "; ".join(conteudo["atividades"])
-            })
-        st.dataframe(pd.DataFrame(dados))
\ No newline at end of file
+    secao_importacao(servico)
+
+    with st.expander("📋 Ver Banco Atual"):
+        temas_pagina, chave_edicao = listagem_paginada(listagem_banco)
+        grade_edicao(servico, banco_semantico, temas_pagina, chave_edicao)
@@ -0,0 +1,240 @@
+import json
+import threading
+
+from icc.aho_corasick import AutomatoGatilhos
+from icc.autocompletar import AutocompletarTemas
+from icc.banco import ServicoBanco, unir_bancos
+from icc.cache import sugestoes_em_cache
+from icc.corretor import CorretorOrtografico
+from icc.importacao import importar_registros
+from icc.indice_invertido import IndiceInvertido
+from icc.listagem import ListagemBanco
+
+
+def dados(*atividades, keywords=()):
+    return {"keywords": list(keywords), "atividades": list(atividades)}
+
+
+def conteudo(servico):
+    return {tema: (tuple(d["keywords"]), tuple(d["atividades"])) for tema, d in servico.obter().items()}
+
+
+def test_diario_reaplicado_ao_recarregar(tmp_path):
+    caminho = tmp_path / "banco.json"
+    servico = ServicoBanco(caminho)
+    servico.salvar({"a": dados("x", keywords=["k"]), "b": dados("y")})
+    servico.salvar({"a": None})
+    servico.salvar({"b": dados("y", "z")})
+
+    assert not caminho.exists()
+    assert conteudo(ServicoBanco(caminho)) == {"b": ((), ("y", "z"))}
+
+
+def test_linha_truncada_do_diario_e_ignorada(tmp_path):
+    caminho = tmp_path / "banco.json"
+    servico = ServicoBanco(caminho)
+    servico.salvar({"a": dados("x")})
+    with open(servico.armazenamento.caminho_diario, "a", encoding="utf-8") as f:
+        f.write('{"tema": "b", "ativ')
+
+    servico = ServicoBanco(caminho)
+    assert conteudo(servico) == {"a": ((), ("x",))}
+    servico.salvar({"c": dados("w")})
+
+    linhas = servico.armazenamento.caminho_diario.read_text(encoding="utf-8").splitlines()
+    assert json.loads(linhas[-1])["tema"] == "c"
+    assert conteudo(ServicoBanco(caminho)) == {"a": ((), ("x",)), "c": ((), ("w",))}
+
+
+def test_compactar_incorpora_diario_e_trunca(tmp_path):
+    caminho = tmp_path / "banco.json"
+    servico = ServicoBanco(caminho)
+    servico.salvar({"a": dados("x")})
+    servico.salvar({"b": dados("y")})
+    servico.salvar({"a": None})
+    servico.armazenamento.limite_diario = 1
+    servico.compactar()
+
+    assert json.loads(caminho.read_text(encoding="utf-8")) == {"b": dados("y")}
+    assert servico.armazenamento.caminho_diario.read_text(encoding="utf-8") == '{"revisao": 3}\n'
+    assert conteudo(servico) == conteudo(ServicoBanco(caminho)) == {"b": ((), ("y",))}
+
+
+def test_compactar_preserva_gravacoes_de_outro_processo(tmp_path):
+    caminho = tmp_path / "banco.json"
+    servico_a = ServicoBanco(caminho)
+    servico_b = ServicoBanco(caminho)
+    for i in range(3):
+        servico_a.salvar({f"a{i}": dados("x")})
+    servico_b.salvar({"de_b": dados("y")})
+    servico_a.armazenamento.limite_diario = 1
+    servico_a.compactar()
+
+    esperados = {"a0", "a1", "a2", "de_b"}
+    assert set(servico_a.obter()) == esperados
+    assert set(json.loads(caminho.read_text(encoding="utf-8"))) == esperados
+    assert set(ServicoBanco(caminho).obter()) == esperados
+
+
+def test_revisao_persiste_entre_servicos_e_compactacao(tmp_path):
+    caminho = tmp_path / "banco.json"
+    servico_a = ServicoBanco(caminho)
+    servico_b = ServicoBanco(caminho)
+    servico_a.salvar({"a": dados("x")})
+    servico_b.salvar({"b": dados("y")})
+    assert servico_a.obter().revisao == servico_b.obter().revisao == 2
+
+    servico_a.armazenamento.limite_diario = 1
+    servico_a.compactar()
+    assert ServicoBanco(caminho).obter().revisao == 2
+    servico_b.salvar({"c": dados("z")})
+    assert servico_a.obter().revisao == ServicoBanco(caminho).obter().revisao == 3
+
+
+def test_revisao_sqlite_vem_de_meta(tmp_path):
+    caminho = tmp_path / "banco.db"
+    servico_a = ServicoBanco(caminho)
+    servico_b = ServicoBanco(caminho)
+    servico_a.salvar({"a": dados("x")})
+    servico_b.salvar({"b": dados("y")})
+
+    assert servico_b.obter().revisao == servico_a.obter().revisao == ServicoBanco(caminho).obter().revisao
+    assert servico_a.obter().revisao == servico_a.armazenamento.assinatura()
+
+
+def test_gravacao_concorrente_nao_fica_escondida(tmp_path):
+    # B tenta gravar enquanto A grava: espera a trava e A depois enxerga a gravação de B
+    caminho = tmp_path / "banco.json"
+    servico_a = ServicoBanco(caminho)
+    servico_b = ServicoBanco(caminho)
+    servico_a.obter()
+    servico_b.obter()
+    gravar_a = servico_a.armazenamento.salvar
+    thread_b = threading.Thread(target=servico_b.salvar, args=({"de_b": dados("y")},))
+
+    def gravar_com_concorrente(alteracoes):
+        thread_b.start()
+        thread_b.join(0.2)
+        assert thread_b.is_alive()
+        gravar_a(alteracoes)
+
+    servico_a.armazenamento.salvar = gravar_com_concorrente
+    servico_a.salvar({"de_a": dados("x")})
+    thread_b.join(5)
+
+    assert set(servico_a.obter()) == set(servico_b.obter()) == {"de_a", "de_b"}
+
+
+def test_sqlite_compartilhado_entre_servicos(tmp_path):
+    caminho = tmp_path / "banco.db"
+    servico_a = ServicoBanco(caminho)
+    servico_b = ServicoBanco(caminho)
+    servico_a.salvar({"a": dados("x", keywords=["k"]), "b": dados("y")})
+    servico_b.salvar({"b": None, "c": dados("z")})
+
+    assert conteudo(servico_a) == {"a": (("k",), ("x",)), "c": ((), ("z",))}
+    assert conteudo(ServicoBanco(caminho)) == conteudo(servico_a)
+
+
+def test_indices_da_fotografia_nao_mudam_com_gravacoes(tmp_path):
+    servico = ServicoBanco(tmp_path / "banco.json", {"direitos humanos": dados("x", keywords=["justiça social"])})
+    antes = servico.obter()
+    indice_antes = antes.derivado("indice", IndiceInvertido)
+    listagem_antes = antes.derivado("listagem", ListagemBanco)
+    servico.salvar({"meio ambiente": dados("horta", keywords=["reciclagem"]), "direitos humanos": None})
+    depois = servico.obter()
+    indice_depois = depois.derivado("indice", IndiceInvertido)
+
+    assert indice_antes.encontrar_temas("justiça social e reciclagem") == ["direitos humanos"]
+    assert listagem_antes.pagina()[0] == ["direitos humanos"]
+    assert indice_depois.banco is depois
+    assert indice_depois.encontrar_temas("justiça social e reciclagem") == ["meio ambiente"]
+    assert depois.derivado("listagem", ListagemBanco).pagina()[0] == ["meio ambiente"]
+
+
+def test_indices_atualizados_iguais_aos_reconstruidos(tmp_path):
+    servico = ServicoBanco(tmp_path / "banco.json")
+    fabricas = {"indice": IndiceInvertido, "corretor": CorretorOrtografico, "autocompletar": AutocompletarTemas, "listagem": ListagemBanco}
+    for i in range(40):
+        banco = servico.obter()
+        for nome, fabrica in fabricas.items():
+            banco.derivado(nome, fabrica)
+        tema = f"tema {i % 7}"
+        servico.salvar({tema: None if i % 5 == 4 else dados(f"atividade {i}", keywords=[f"palavra{i % 3}", "afro"])})
+
+    banco = servico.obter()
+    atualizados = {nome: banco.derivado(nome, fabrica) for nome, fabrica in fabricas.items()}
+    novos = {nome: fabrica(banco) for nome, fabrica in fabricas.items()}
+    assert atualizados["indice"].frases.conjuntos == novos["indice"].frases.conjuntos
+    assert atualizados["indice"].por_inicio.conjuntos == novos["indice"].por_inicio.conjuntos
+    assert atualizados["corretor"].delecoes.conjuntos == novos["corretor"].delecoes.conjuntos
+    assert +atualizados["corretor"].frequencias == novos["corretor"].frequencias
+    assert atualizados["autocompletar"].entradas == novos["autocompletar"].entradas
+    assert +atualizados["autocompletar"].popularidade == novos["autocompletar"].popularidade
+    assert atualizados["listagem"].ordem == novos["listagem"].ordem
+    assert atualizados["listagem"].por_contagem == novos["listagem"].por_contagem
+    assert atualizados["listagem"].por_keyword.vocabulario == novos["listagem"].por_keyword.vocabulario
+
+
+def test_leitores_sem_trava_durante_gravacoes(tmp_path):
+    servico = ServicoBanco(tmp_path / "banco.json")
+    servico.salvar({f"tema {i}": dados("x", keywords=[f"k{i}"]) for i in range(50)})
+    parar = threading.Event()
+    erros = []
+
+    def ler():
+        while not parar.is_set():
+            try:
+                banco = servico.obter()
+                indice = banco.derivado("indice", IndiceInvertido)
+                listagem = banco.derivado("listagem", ListagemBanco)
+                for tema in indice.encontrar_temas("tema k1 k2 k3"):
+                    assert tema in banco
+                listagem.pagina(2, tema="tema")
+                banco.derivado("corretor", CorretorOrtografico).corrigir("tmea")
+                banco.derivado("autocompletar", AutocompletarTemas).completar("te")
+            except Exception as erro:
+                erros.append(erro)
+
+    leitores = [threading.Thread(target=ler) for _ in range(4)]
+    for leitor in leitores:
+        leitor.start()
+    for i in range(60):
+        servico.salvar({f"tema {i % 50}": None if i % 3 else dados("y", keywords=[f"k{i}"])})
+    parar.set()
+    for leitor in leitores:
+        leitor.join()
+    assert erros == []
+
+
+def test_sugestoes_em_cache_acompanham_importacao(tmp_path):
+    caminho = tmp_path / "banco.json"
+    servico = ServicoBanco(caminho, {"horta": dados("plantio", keywords=["horta"])})
+
+    def sugestoes(tema):
+        banco = servico.obter()
+        indice = banco.derivado("indice", IndiceInvertido)
+        return sugestoes_em_cache(caminho, "encontrar_atividades", tema, lambda t: tuple(indice.encontrar_atividades(t)), banco.versao)
+
+    vistas = []
+    assert sugestoes("horta") == ("plantio",)
+    novas = ["compostagem com restos da merenda", "mural sobre sementes crioulas", "visita a uma feira agroecológica"]
+    registros = [(numero, ("horta", [], [atividade]), None) for numero, atividade in enumerate(novas, start=2)]
+    importar_registros(servico, registros, tamanho_lote=1, progresso=lambda contagem: vistas.append(sugestoes("horta")))
+
+    assert vistas == [("plantio", *novas[:1]), ("plantio", *novas[:2]), ("plantio", *novas)]
+    assert sugestoes("horta") == vistas[-1]
+
+
+def test_unir_bancos_soma_gatilhos_e_atividades(tmp_path):
+    servico = ServicoBanco(tmp_path / "banco.json")
+    servico.salvar({"antirracista": dados("mural", "debate", keywords=["racismo", "afro"]), "horta": dados("plantio")})
+    local = {"antirracista": dados("debate", "podcast", keywords=["preconceito", "racismo"])}
+
+    unido = unir_bancos(local, servico.obter())
+
+    assert unido == {
+        "antirracista": {"keywords": ["preconceito", "racismo", "afro"], "atividades": ["debate", "podcast", "mural"]},
+        "horta": {"keywords": [], "atividades": ["plantio"]},
+    }
+    assert list(AutomatoGatilhos(unido).temas_encontrados("preconceito na escola")) == ["antirracista"]
@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+
+import icc.banco_compacto
+from icc.banco_compacto import BancoCompacto, ler_temas
+
+BANCO = {
+    "direitos humanos": {"keywords": ["justiça", "igualdade"], "atividades": ["roda de conversa", "mural"]},
+    "meio ambiente": ["horta", "reciclagem \"criativa\"", "trilha"],
+    "vazio": {"keywords": [], "atividades": []},
+    "açãoé 1": ["água"],
+}
+
+
+def esperado():
+    return [(tema, dados if isinstance(dados, dict) else {"keywords": [], "atividades": dados}) for tema, dados in BANCO.items()]
+
+
+@pytest.mark.parametrize("tamanho", [1, 2, 3, 5, 7, 16, 1 << 16])
+@pytest.mark.parametrize("indentacao", [None, 2])
+def test_ler_temas_atravessa_blocos(tmp_path, monkeypatch, tamanho, indentacao):
+    monkeypatch.setattr(icc.banco_compacto, "TAMANHO_BLOCO_LEITURA", tamanho)
+    caminho = tmp_path / "banco.json"
+    caminho.write_text(json.dumps(BANCO, ensure_ascii=False, indent=indentacao), encoding="utf-8")
+
+    assert list(ler_temas(caminho)) == esperado()
+
+
+@pytest.mark.parametrize("tamanho", [1, 4])
+def test_ler_temas_de_arquivo_aberto(monkeypatch, tamanho):
+    monkeypatch.setattr(icc.banco_compacto, "TAMANHO_BLOCO_LEITURA", tamanho)
+
+    assert list(ler_temas(io.StringIO(json.dumps(BANCO)))) == esperado()
+    assert list(ler_temas(io.StringIO(" { } "))) == []
+
+
+@pytest.mark.parametrize("texto", ['{"a": ["x"]', '{"a": ["x"], ', '{"a" ["x"]}', '["x"]', ""])
+def test_ler_temas_rejeita_arquivo_invalido(monkeypatch, texto):
+    monkeypatch.setattr(icc.banco_compacto, "TAMANHO_BLOCO_LEITURA", 3)
+
+    with pytest.raises(ValueError):
+        list(ler_temas(io.StringIO(texto)))
+
+
+def test_banco_compacto_devolve_dados_lidos(tmp_path, monkeypatch):
+    monkeypatch.setattr(icc.banco_compacto, "TAMANHO_BLOCO_LEITURA", 5)
+    caminho = tmp_path / "banco.json"
+    caminho.write_text(json.dumps(BANCO), encoding="utf-8")
+    banco = BancoCompacto()
+    for tema, dados in ler_temas(caminho):
+        banco.adicionar(tema, dados)
+
+    assert banco.como_dict() == dict(esperado())
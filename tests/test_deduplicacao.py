@@ -0,0 +1,57 @@
+from icc.banco import ServicoBanco
+from icc.deduplicacao import mesclar_atividades
+from icc.importacao import importar_registros
+
+EXISTENTES = ["Roda de conversa sobre machismo", "Roda de conversa sobre o machismo", "Mural coletivo"]
+
+
+def test_mesclar_nao_mexe_nas_existentes():
+    atividades, repetidas, parecidas = mesclar_atividades(EXISTENTES, [])
+
+    assert (atividades, repetidas, parecidas) == (EXISTENTES, [], [])
+
+
+def test_mesclar_mantem_atividades_diferentes():
+    atividades, repetidas, parecidas = mesclar_atividades(EXISTENTES, ["Roda de conversa sobre racismo"])
+
+    assert atividades == [*EXISTENTES, "Roda de conversa sobre racismo"]
+    assert repetidas == parecidas == []
+
+
+def test_mesclar_descarta_so_repeticoes():
+    novas = ["Mural coletivo", "  mural   COLETIVO! ", "Horta", "horta."]
+
+    atividades, repetidas, parecidas = mesclar_atividades(EXISTENTES, novas)
+
+    assert atividades == [*EXISTENTES, "Horta"]
+    # Reenviar o mesmo texto não é relatado
+    assert repetidas == [("  mural   COLETIVO! ", "Mural coletivo"), ("horta.", "Horta")]
+    assert parecidas == []
+
+
+def test_mesclar_devolve_parecidas_para_confirmacao():
+    novas = ["Mural coletivo na escola", "Mural coletivo na escola", "Oficina de tambores"]
+
+    atividades, repetidas, parecidas = mesclar_atividades(["Mural coletivo na escola pública"], novas)
+
+    assert atividades == ["Mural coletivo na escola pública", "Oficina de tambores"]
+    assert repetidas == []
+    assert [(parecida, presente) for parecida, presente, _ in parecidas] == [("Mural coletivo na escola", "Mural coletivo na escola pública")]
+    assert parecidas[0][2] >= 0.8
+
+
+def test_importacao_soma_parecidas_e_conta_so_as_novas(tmp_path):
+    servico = ServicoBanco(tmp_path / "banco.json", {"machismo": {"keywords": [], "atividades": EXISTENTES}})
+    registros = [
+        (2, ("machismo", [], ["Mural coletivo", "Roda de conversa sobre o machismo hoje", "Júri simulado"]), None),
+        (3, ("machismo", [], ["Roda de conversa sobre racismo"]), None),
+    ]
+    relatadas = []
+
+    contagem = importar_registros(servico, registros, parecidas=lambda *parecida: relatadas.append(parecida[:3]))
+
+    assert list(servico.obter()["machismo"]["atividades"]) == [
+        *EXISTENTES, "Júri simulado", "Roda de conversa sobre racismo", "Roda de conversa sobre o machismo hoje"
+    ]
+    assert relatadas == [("machismo", "Roda de conversa sobre o machismo hoje", "Roda de conversa sobre o machismo")]
+    assert (contagem["atividades"], contagem["parecidas"], contagem["duplicatas"]) == (3, 1, 0)
@@ -0,0 +1,110 @@
+import math
+
+from icc.banco import ServicoBanco
+from icc.edicao import COLUNA_ORIGINAL, diferencas, linhas_edicao, valores_originais
+
+BANCO = {
+    "direitos humanos": {"keywords": ["justiça", "igualdade"], "atividades": ["roda de conversa", "mural"]},
+    "meio ambiente": {"keywords": ["reciclagem"], "atividades": ["horta"]},
+    "cultura afro": {"keywords": [], "atividades": ["oficina de tambores"]},
+}
+
+
+def test_diferencas_sem_edicao_nao_altera_nada():
+    originais = valores_originais(BANCO, BANCO)
+
+    assert diferencas(originais, linhas_edicao(originais)) == ({}, {})
+
+
+def test_diferencas_detecta_insercao_alteracao_e_remocao():
+    originais = valores_originais(BANCO, ["direitos humanos", "meio ambiente", "cultura afro"])
+    linhas = linhas_edicao(originais)
+    linhas[0]["Atividades"] = "roda de conversa\n  mural \n\njúri simulado"
+    del linhas[1]
+    linhas.append({"Temática": "  Educação Financeira ", "Palavras-chave": "orçamento, Poupança", "Atividades": "feira"})
+    # Linhas vazias deixadas pelo st.data_editor chegam com NaN/None
+    linhas.append({"Temática": math.nan, "Palavras-chave": None, "Atividades": None})
+
+    alteracoes, esperados = diferencas(originais, linhas)
+
+    assert alteracoes == {
+        "direitos humanos": {"keywords": ["justiça", "igualdade"], "atividades": ["roda de conversa", "mural", "júri simulado"]},
+        "educação financeira": {"keywords": ["orçamento", "poupança"], "atividades": ["feira"]},
+        "meio ambiente": None,
+    }
+    assert esperados == {
+        "direitos humanos": originais["direitos humanos"],
+        "educação financeira": None,
+        "meio ambiente": originais["meio ambiente"],
+    }
+
+
+def test_diferencas_preserva_nomes_e_atividades_existentes():
+    banco = {
+        "Consciência sobre direitos LGBTQIA+": {"keywords": ["Diversidade"], "atividades": ["Debate; com convidados", "Mural | coletivo"]},
+        " espaços extras ": {"keywords": [], "atividades": ["a"]},
+    }
+    originais = valores_originais(banco, banco)
+    linhas = linhas_edicao(originais)
+
+    assert diferencas(originais, linhas) == ({}, {})
+
+    linhas[0]["Atividades"] += "\nRoda de conversa"
+    alteracoes, _ = diferencas(originais, linhas)
+    assert alteracoes == {"Consciência sobre direitos LGBTQIA+": {
+        "keywords": ["Diversidade"], "atividades": ["Debate; com convidados", "Mural | coletivo", "Roda de conversa"]
+    }}
+
+
+def test_diferencas_renomear_grava_a_nova_e_remove_a_antiga():
+    originais = valores_originais(BANCO, BANCO)
+    linhas = linhas_edicao(originais)
+    linhas[2]["Temática"] = "Cultura Afro-brasileira"
+    # Troca de nomes entre duas linhas: as duas temáticas são regravadas, nenhuma removida
+    linhas[0]["Temática"], linhas[1]["Temática"] = "meio ambiente", "direitos humanos"
+
+    alteracoes, esperados = diferencas(originais, linhas)
+
+    assert alteracoes == {
+        "cultura afro-brasileira": {"keywords": [], "atividades": ["oficina de tambores"]},
+        "cultura afro": None,
+        "meio ambiente": {"keywords": ["justiça", "igualdade"], "atividades": ["roda de conversa", "mural"]},
+        "direitos humanos": {"keywords": ["reciclagem"], "atividades": ["horta"]},
+    }
+    assert esperados["cultura afro-brasileira"] is None
+    assert esperados["meio ambiente"] == originais["meio ambiente"]
+    assert all(linha[COLUNA_ORIGINAL] in originais for linha in linhas)
+
+
+def test_salvar_se_inalterado_grava_o_que_nao_mudou(tmp_path):
+    servico = ServicoBanco(tmp_path / "banco.json", BANCO)
+    originais = valores_originais(servico.obter(), BANCO)
+    linhas = linhas_edicao(originais)
+    for linha in linhas:
+        linha["Atividades"] += "\ndebate"
+    alteracoes, esperados = diferencas(originais, linhas)
+
+    # Outra pessoa altera uma temática da página antes do curador salvar
+    servico.salvar({"meio ambiente": {"keywords": ["reciclagem"], "atividades": ["horta", "trilha"]}})
+    conflitos = servico.salvar_se_inalterado(alteracoes, esperados)
+
+    banco = servico.obter()
+    assert conflitos == ["meio ambiente"]
+    assert list(banco["meio ambiente"]["atividades"]) == ["horta", "trilha"]
+    assert list(banco["direitos humanos"]["atividades"]) == ["roda de conversa", "mural", "debate"]
+    assert list(banco["cultura afro"]["atividades"]) == ["oficina de tambores", "debate"]
+
+
+def test_salvar_se_inalterado_detecta_tematica_criada_ou_removida_por_outro(tmp_path):
+    caminho = tmp_path / "banco.json"
+    servico = ServicoBanco(caminho)
+    servico.salvar(BANCO)
+    outro = ServicoBanco(caminho)
+    alteracoes = {"nova": {"keywords": [], "atividades": ["x"]}, "cultura afro": {"keywords": [], "atividades": ["y"]}}
+    esperados = {"nova": None, "cultura afro": valores_originais(BANCO, ["cultura afro"])["cultura afro"]}
+
+    outro.salvar({"nova": {"keywords": [], "atividades": ["z"]}, "cultura afro": None})
+
+    assert sorted(servico.salvar_se_inalterado(alteracoes, esperados)) == ["cultura afro", "nova"]
+    assert "cultura afro" not in servico.obter()
+    assert list(servico.obter()["nova"]["atividades"]) == ["z"]
@@ -0,0 +1,38 @@
+from icc.listagem import ListagemBanco
+
+
+def banco(n):
+    return {
+        f"tema {i:02d}": {"keywords": ["par" if i % 2 == 0 else "ímpar"], "atividades": [f"atividade {j}" for j in range(i % 4)]}
+        for i in range(n)
+    }
+
+
+def test_pagina_devolve_temas_linhas_e_total():
+    listagem = ListagemBanco(banco(30))
+
+    temas, linhas, total = listagem.pagina(2, tamanho=10, keyword="par")
+
+    assert total == 15
+    assert temas == [f"tema {i:02d}" for i in range(20, 30, 2)]
+    assert [linha["Temática"] for linha in linhas] == [tema.title() for tema in temas]
+    assert linhas[1] == {"Temática": "Tema 22", "Palavras-chave": "par", "Nº de atividades": 2, "Atividades": "atividade 0; atividade 1"}
+
+
+def test_pagina_alem_da_ultima_mostra_a_ultima():
+    listagem = ListagemBanco(banco(30))
+
+    assert listagem.pagina(9, tamanho=10, minimo_atividades=3) == listagem.pagina(1, tamanho=10, minimo_atividades=3)
+    assert listagem.pagina(4, tamanho=10)[0] == [f"tema {i:02d}" for i in range(20, 30)]
+    assert listagem.pagina(3, tamanho=10, tema="inexistente") == ([], [], 0)
+
+
+def test_pagina_filtra_uma_vez(monkeypatch):
+    listagem = ListagemBanco(banco(30))
+    chamadas = []
+    filtrar = listagem.filtrar
+    monkeypatch.setattr(listagem, "filtrar", lambda **filtros: chamadas.append(filtros) or filtrar(**filtros))
+
+    listagem.pagina(2, atividade="atividade 2")
+
+    assert chamadas == [{"atividade": "atividade 2"}]
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from icc.pontuacao import CRITERIOS, calcular_icc, calcular_icc_lote, interpretar_icc
+
+NOTAS = [
+    [4] * len(CRITERIOS),
+    [1, 2, 3, 4, 1, 2, 3, 4, 1, 2, 3],
+    [3, 3, 2, 2, 4, 1, 1, 4, 3, 2, 4],
+]
+PESOS = [
+    [1] * len(CRITERIOS),
+    [0, 0, 5, 1, 0, 2, 0, 0, 0.5, 0, 3],
+    [2, 1, 1, 3, 1, 1, 2, 1, 1, 1, 1],
+]
+
+
+def test_lote_igual_a_avaliacoes_individuais():
+    icc, interpretacoes = calcular_icc_lote(NOTAS, PESOS)
+
+    for notas, pesos, valor, interpretacao in zip(NOTAS, PESOS, icc, interpretacoes):
+        esperado = calcular_icc(dict(zip(CRITERIOS, notas)), dict(zip(CRITERIOS, pesos)))
+        assert valor == pytest.approx(esperado)
+        assert interpretacao == interpretar_icc(esperado)
+    assert icc[0] == pytest.approx(1.0)
+
+
+def test_lote_com_vetor_de_pesos_compartilhado():
+    icc, _ = calcular_icc_lote(NOTAS, PESOS[2])
+
+    assert icc == pytest.approx(calcular_icc_lote(NOTAS, [PESOS[2]] * len(NOTAS))[0])
+
+
+def test_lote_vazio():
+    icc, interpretacoes = calcular_icc_lote([], PESOS[0])
+
+    assert icc.shape == interpretacoes.shape == (0,)
+
+
+def test_pesos_todos_zero_sao_rejeitados():
+    notas = dict(zip(CRITERIOS, NOTAS[1]))
+    pesos = dict.fromkeys(CRITERIOS, 0)
+
+    with pytest.raises(ValueError):
+        calcular_icc(notas, pesos)
+    with pytest.raises(ValueError):
+        calcular_icc_lote(NOTAS, [PESOS[0], [0] * len(CRITERIOS), PESOS[2]])
+
+
+def test_notas_fora_da_escala_sao_rejeitadas():
+    with pytest.raises(ValueError):
+        calcular_icc_lote([[5] * len(CRITERIOS)], PESOS[0])
+    with pytest.raises(ValueError):
+        calcular_icc_lote(np.full((1, len(CRITERIOS)), 2.5), PESOS[0])
@@ -0,0 +1,40 @@
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from icc.pontuacao import CRITERIOS
+from icc.relatorios_lote import gerar_relatorios, nome_arquivo_relatorio, relatorios_em_janela
+
+
+def tarefa(indice):
+    notas = dict.fromkeys(CRITERIOS, 1 + indice % 4)
+    return indice, f"Pessoa {indice}", "meio ambiente", notas, dict.fromkeys(CRITERIOS, 1), ["horta"]
+
+
+def test_janela_limita_tarefas_lidas_e_mantem_a_ordem():
+    lidas = []
+
+    def tarefas():
+        for indice in range(1, 31):
+            lidas.append(indice)
+            yield tarefa(indice)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        relatorios = relatorios_em_janela(executor, tarefas(), tamanho_bloco=2, janela=3)
+        nome, conteudo = next(relatorios)
+        assert len(lidas) <= 2 * 3
+        nomes = [nome] + [nome for nome, _ in relatorios]
+
+    assert conteudo.startswith(b"%PDF")
+    assert nomes == [nome_arquivo_relatorio(i, f"Pessoa {i}") for i in range(1, 31)]
+
+
+def test_gerar_relatorios_em_zip_com_progresso(tmp_path):
+    progresso = []
+    destino = tmp_path / "relatorios.zip"
+
+    total, _ = gerar_relatorios(map(tarefa, range(1, 8)), destino, trabalhadores=2, tamanho_bloco=3, progresso=progresso.append)
+
+    assert total == 7
+    assert progresso == [3, 6, 7]
+    with zipfile.ZipFile(destino) as arquivo_zip:
+        assert arquivo_zip.namelist() == [nome_arquivo_relatorio(i, f"Pessoa {i}") for i in range(1, 8)]